@@ -0,0 +1,170 @@
+"""Checks shared by the offline Parallel payload validators (not a standalone script)."""
+
+from __future__ import annotations
+
+import functools
+import json
+import multiprocessing
+import os
+import re
+import sys
+from datetime import date
+from pathlib import Path
+from typing import Any, Callable, Sequence
+
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is the fallback
+    orjson = None
+
+# Plain domain/subdomain ("sec.gov", "bücher.de", "_dmarc.example.com", "example.com."), wildcard
+# ("*.example.com") or bare extension (".gov"): dot-separated labels only, so no scheme, path, port,
+# or whitespace. Labels are letters/digits in any script plus "-" and "_" (IDNs need not be
+# punycoded); one trailing dot is allowed.
+_LABEL = r"[\w-]{1,63}"
+DOMAIN_RE = re.compile(rf"(?:\.{_LABEL}(?:\.{_LABEL})*|\*(?:\.{_LABEL})+|{_LABEL}(?:\.{_LABEL})+)\.?")
+
+# Below this many files, worker start-up costs more than validating serially.
+PARALLEL_MIN_FILES = 8
+
+# Integers of up to 18 digits always fit orjson's 64-bit range; longer digit runs may not.
+_LONG_DIGITS_RE = re.compile(rb"[0-9]{19}")
+
+# Shape pre-check so obviously malformed dates are rejected without raising ValueError.
+_ISO_DATE_RE = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2}")
+
+
+class StopValidation(Exception):
+    """Raised to abandon validation as soon as the first error is recorded."""
+
+
+class FailFastErrors(list):
+    """Error list for ``--fail-fast``: recording the first error stops validation."""
+
+    def append(self, item: str) -> None:
+        super().append(item)
+        raise StopValidation
+
+
+def _loads(data: bytes) -> Any:
+    # orjson turns integers beyond 64 bits into floats, while stdlib json keeps them exact. Any run
+    # of 19+ digits might be such an integer, so those payloads go to stdlib (false positives in
+    # strings only cost speed).
+    if orjson is not None and _LONG_DIGITS_RE.search(data) is None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson is stricter than stdlib json (e.g. lone surrogate escapes); let stdlib decide
+            # so both paths accept the same payloads.
+            pass
+    return json.loads(data)
+
+
+@functools.lru_cache(maxsize=128)
+def _load_json_cached(path: str, mtime_ns: int, size: int) -> Any:
+    # (mtime_ns, size) is part of the key so an edited file is re-parsed. The parsed value is
+    # shared between hits without copying; validation only reads it.
+    return _loads(Path(path).read_bytes())
+
+
+def load_json(path: str) -> Any:
+    """Parse a payload file, or stdin for ``-``, straight from its raw bytes."""
+    if path == "-":
+        return _loads(sys.stdin.buffer.read())
+    st = os.stat(path)
+    return _load_json_cached(path, st.st_mtime_ns, st.st_size)
+
+
+def is_iso_date(value: str) -> bool:
+    """True for a real calendar date written exactly as YYYY-MM-DD."""
+    if _ISO_DATE_RE.fullmatch(value) is None:
+        return False
+    try:
+        date.fromisoformat(value)
+    except ValueError:  # right shape, impossible date such as 2024-13-40
+        return False
+    return True
+
+
+def is_domain_selector(value: Any) -> bool:
+    """True for a string ``include_domains``/``exclude_domains`` entry matching ``DOMAIN_RE``."""
+    return isinstance(value, str) and DOMAIN_RE.fullmatch(value) is not None
+
+
+def check_domain_list(
+    arr: Any,
+    path: str,
+    error: Callable[[str, str], None],
+    warn: Callable[[str, str], None],
+    max_items: int,
+) -> None:
+    """Check an include_domains/exclude_domains value, reporting through ``error``/``warn``."""
+    if not isinstance(arr, list):
+        error(path, "must be an array of domain selectors")
+        return
+    if len(arr) > max_items:
+        warn(path, f"{len(arr)} entries exceeds docs guidance ({max_items})")
+    item_prefix = path + "["
+    for i, item in enumerate(arr):
+        if not isinstance(item, str):
+            error(item_prefix + str(i) + "]", "must be a string")
+        elif not is_domain_selector(item):
+            error(
+                item_prefix + str(i) + "]",
+                "must be a plain domain, subdomain, or bare extension like '.gov' (no scheme/path)",
+            )
+
+
+def _summary_code(n_errors: int, n_warnings: int, strict: bool) -> int:
+    """Exit code for one payload's findings; prints ``OK`` when it passes."""
+    if n_errors:
+        return 1
+    if strict and n_warnings:
+        return 1
+    print("OK")
+    return 0
+
+
+def print_report(errors: list[str], warnings: list[str], strict: bool) -> int:
+    print(f"errors={len(errors)} warnings={len(warnings)}")
+    for msg in errors:
+        print(f"ERROR  {msg}")
+    for msg in warnings:
+        print(f"WARN   {msg}")
+    return _summary_code(len(errors), len(warnings), strict)
+
+
+def validate_many(
+    paths: list[str],
+    validate_file: Callable[..., tuple[str, list[str], list[str], str | None]],
+    extra_args: tuple[Any, ...],
+    header: Sequence[str],
+    strict: bool,
+) -> int:
+    """Run ``validate_file(path, *extra_args)`` over several files and print one report per file.
+
+    Larger batches fan out to worker processes, so ``validate_file`` must be a module-level
+    function. ``header`` lines are printed once before the per-file sections.
+    """
+    jobs = [(path, *extra_args) for path in paths]
+    if len(paths) >= PARALLEL_MIN_FILES:
+        with multiprocessing.Pool() as pool:
+            results = pool.starmap(validate_file, jobs)
+    else:
+        results = [validate_file(*job) for job in jobs]
+
+    for line in header:
+        print(line)
+    rc = 0
+    failed = 0
+    for path, errors, warnings, read_error in results:
+        print(f"file={path}")
+        if read_error is not None:
+            print(f"ERROR  {read_error}")
+            code = 2
+        else:
+            code = print_report(errors, warnings, strict)
+        rc = max(rc, code)
+        failed += code != 0
+    print(f"files={len(results)} failed={failed}")
+    return rc
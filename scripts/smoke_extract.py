@@ -6,40 +6,143 @@ from __future__ import annotations
 import argparse
 import json
 import os
+import sys
 import urllib.error
 import urllib.request
+from itertools import islice
+from pathlib import Path
 from typing import Any
 
-DEFAULT_API_BASE = os.environ.get("PARALLEL_API_BASE_URL", "https://api.parallel.ai")
-DEFAULT_EXTRACT_BETA = "search-extract-2025-10-10"
+try:
+    import orjson
+
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:  # optional speedup; stdlib json is the fallback
+    orjson = None
+
+    def _dumps(value: Any) -> bytes:
+        return json.dumps(value).encode("utf-8")
+
+    _loads = json.loads
 
+try:
+    import simdjson
+except ImportError:  # optional speedup; falls back to a full parse
+    simdjson = None
 
-def post_json(url: str, api_key: str, payload: dict[str, Any], betas: list[str], timeout: float) -> tuple[int, Any]:
-    headers = {
-        "content-type": "application/json",
-        "x-api-key": api_key,
-    }
-    if betas:
-        headers["parallel-beta"] = ",".join(betas)
-    req = urllib.request.Request(url, data=json.dumps(payload).encode("utf-8"), headers=headers, method="POST")
-    try:
-        with urllib.request.urlopen(req, timeout=timeout) as resp:
-            body = resp.read().decode("utf-8")
-            return resp.getcode(), json.loads(body)
-    except urllib.error.HTTPError as e:
-        body = e.read().decode("utf-8", errors="replace")
+DEFAULT_API_BASE = "https://api.parallel.ai"
+DEFAULT_EXTRACT_BETA = "search-extract-2025-10-10"
+# Shared stand-in for missing/null arrays so preview loops don't allocate a fresh [] each time.
+_EMPTY: tuple[Any, ...] = ()
+
+
+def print_json(value: Any) -> None:
+    """Pretty-print ``value`` as JSON; with orjson the encoded bytes go straight to stdout."""
+    buffer = getattr(sys.stdout, "buffer", None)
+    if orjson is None or buffer is None:
+        print(json.dumps(value, indent=2))
+        return
+    sys.stdout.flush()
+    buffer.write(orjson.dumps(value, option=orjson.OPT_INDENT_2))
+    buffer.write(b"\n")
+
+
+def loads_lazy(body: bytes) -> Any:
+    """Parse a response body so that only the fields actually read get decoded.
+
+    With pysimdjson installed this returns a read-only proxy (supports ``[]``,
+    ``.get`` and ``len``); otherwise it is a regular full parse.
+    """
+    if simdjson is None:
+        return _loads(body)
+    # A fresh parser per body: a simdjson.Parser refuses to re-parse while a document it
+    # returned is still alive, and the caller may still hold the previous chunk's response.
+    return simdjson.Parser().parse(body)
+
+
+class ExtractClient:
+    """Extract API caller that builds headers and the shared payload options once.
+
+    ``extract`` only adds the ``urls`` batch, so chunking a long URL list reuses the
+    same headers dict and option values for every request.
+    """
+
+    def __init__(self, api_base: str, api_key: str, betas: list[str], options: dict[str, Any], timeout: float) -> None:
+        self.url = api_base.rstrip("/") + "/v1beta/extract"
+        self.headers = {
+            "content-type": "application/json",
+            "x-api-key": api_key,
+        }
+        if betas:
+            self.headers["parallel-beta"] = ",".join(betas)
+        self.options = options
+        self.timeout = timeout
+
+    def extract(self, urls: list[str], *, lazy: bool = False) -> tuple[int, Any]:
+        payload = {"urls": urls, **self.options}
+        req = urllib.request.Request(self.url, data=_dumps(payload), headers=self.headers, method="POST")
         try:
-            parsed = json.loads(body)
-        except json.JSONDecodeError:
-            parsed = {"raw": body}
-        return e.code, parsed
+            with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+                code = resp.getcode()
+                body = resp.read()
+                # Only 200 bodies are inspected field-by-field; anything else may be dumped whole.
+                return code, loads_lazy(body) if lazy and code == 200 else _loads(body)
+        except urllib.error.HTTPError as e:
+            body = e.read()
+            try:
+                parsed = _loads(body)
+            except ValueError:  # not JSON (or not UTF-8); only now pay for a decode
+                parsed = {"raw": body.decode("utf-8", errors="replace")}
+            return e.code, parsed
+
+
+def read_urls_file(path: str) -> list[str]:
+    """Read one URL per line, skipping blank lines and ``#`` comments."""
+    urls = []
+    for line in Path(path).read_text().splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            urls.append(line)
+    return urls
+
+
+def report(resp: Any, succeeded: bool, raw: bool) -> bool:
+    """Print the summary for one Extract response; return ``succeeded``."""
+    if raw:
+        print_json(resp)
+
+    if not succeeded:
+        print("Extract smoke test failed")
+        if not raw:
+            print_json(resp)
+        return False
+
+    results = resp.get("results") or _EMPTY
+    errors = resp.get("errors") or _EMPTY
+    warnings = resp.get("warnings") or _EMPTY
+    usage = resp.get("usage") or _EMPTY
+    print(f"extract_id={resp.get('extract_id')}")
+    print(f"results_count={len(results)} errors_count={len(errors)} warnings_count={len(warnings)} usage_items={len(usage)}")
+    for i, item in enumerate(islice(results, 5), start=1):
+        excerpts = item.get("excerpts") or _EMPTY
+        full_content = item.get("full_content") or ""
+        print(
+            f"{i}. {item.get('url')} | excerpts={len(excerpts)} | full_content_chars={len(full_content)} | title={item.get('title')}"
+        )
+    for i, err in enumerate(islice(errors, 5), start=1):
+        print(f"ERR{i}. {err.get('url')} | {err.get('error_type')} | {err.get('http_status_code')}")
+    return True
 
 
 def main() -> int:
     parser = argparse.ArgumentParser(description="Run a minimal Parallel Extract API smoke test")
     parser.add_argument("--api-key", default=os.environ.get("PARALLEL_API_KEY"), help="Parallel API key (defaults to PARALLEL_API_KEY)")
-    parser.add_argument("--api-base", default=DEFAULT_API_BASE, help=f"API base URL (default: {DEFAULT_API_BASE})")
+    default_api_base = os.environ.get("PARALLEL_API_BASE_URL", DEFAULT_API_BASE)
+    parser.add_argument("--api-base", default=default_api_base, help=f"API base URL (default: {default_api_base})")
     parser.add_argument("--url", dest="urls", action="append", default=[], help="URL to extract (repeatable). Defaults to https://www.example.com")
+    parser.add_argument("--urls-file", help="File with one URL per line; sent in --batch-size chunks (in addition to any --url)")
+    parser.add_argument("--batch-size", type=int, default=10, help="URLs per Extract request when using --urls-file")
     parser.add_argument("--objective", help="Optional objective to focus excerpts")
     parser.add_argument("--search-query", action="append", default=[], help="Optional search query for focused excerpts (repeatable)")
     parser.add_argument("--excerpts", dest="excerpts", action="store_true", help="Request excerpts (default true)")
@@ -56,48 +159,40 @@ def main() -> int:
         print("SKIPPED: PARALLEL_API_KEY is not set (or pass --api-key)")
         return 0
 
-    urls = args.urls or ["https://www.example.com"]
+    urls = list(args.urls)
+    if args.urls_file:
+        try:
+            urls.extend(read_urls_file(args.urls_file))
+        except OSError as exc:
+            print(f"ERROR: failed to read --urls-file: {exc}", file=sys.stderr)
+            return 2
+    urls = urls or ["https://www.example.com"]
     betas = list(args.beta) if args.beta else [DEFAULT_EXTRACT_BETA]
 
-    payload: dict[str, Any] = {"urls": urls, "excerpts": args.excerpts}
+    options: dict[str, Any] = {"excerpts": args.excerpts}
     if args.objective:
-        payload["objective"] = args.objective
+        options["objective"] = args.objective
     if args.search_query:
-        payload["search_queries"] = args.search_query
+        options["search_queries"] = args.search_query
     if args.full_content_max_chars is not None:
-        payload["full_content"] = {"max_chars_per_result": args.full_content_max_chars}
+        options["full_content"] = {"max_chars_per_result": args.full_content_max_chars}
     elif args.full_content:
-        payload["full_content"] = True
-
-    url = args.api_base.rstrip("/") + "/v1beta/extract"
-    status, resp = post_json(url, args.api_key, payload, betas, args.timeout)
-
-    print(f"status={status}")
-    print(f"betas={','.join(betas)}")
-
-    if args.raw:
-        print(json.dumps(resp, indent=2))
-
-    if status != 200:
-        print("Extract smoke test failed")
-        if not args.raw:
-            print(json.dumps(resp, indent=2))
+        options["full_content"] = True
+
+    client = ExtractClient(args.api_base, args.api_key, betas, options, args.timeout)
+    batch_size = max(1, args.batch_size) if args.urls_file else len(urls)
+    chunks = [urls[i : i + batch_size] for i in range(0, len(urls), batch_size)]
+
+    ok = True
+    for n, chunk in enumerate(chunks, start=1):
+        status, resp = client.extract(chunk, lazy=not args.raw)
+        if len(chunks) > 1:
+            print(f"chunk={n}/{len(chunks)} urls={len(chunk)}")
+        print(f"status={status}")
+        print(f"betas={','.join(betas)}")
+        ok = report(resp, status == 200, args.raw) and ok
+    if not ok:
         return 1
-
-    results = resp.get("results") or []
-    errors = resp.get("errors") or []
-    warnings = resp.get("warnings") or []
-    usage = resp.get("usage") or []
-    print(f"extract_id={resp.get('extract_id')}")
-    print(f"results_count={len(results)} errors_count={len(errors)} warnings_count={len(warnings)} usage_items={len(usage)}")
-    for i, item in enumerate(results[: min(5, len(results))], start=1):
-        excerpts = item.get("excerpts") or []
-        full_content = item.get("full_content") or ""
-        print(
-            f"{i}. {item.get('url')} | excerpts={len(excerpts)} | full_content_chars={len(full_content)} | title={item.get('title')}"
-        )
-    for i, err in enumerate(errors[: min(5, len(errors))], start=1):
-        print(f"ERR{i}. {err.get('url')} | {err.get('error_type')} | {err.get('http_status_code')}")
     print("OK")
     return 0
 
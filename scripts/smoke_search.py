@@ -10,10 +10,36 @@ import sys
 import urllib.error
 import urllib.parse
 import urllib.request
+from itertools import islice
 from typing import Any, Iterable
 
-DEFAULT_API_BASE = os.environ.get("PARALLEL_API_BASE_URL", "https://api.parallel.ai")
+try:
+    import orjson
+
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:  # optional speedup; stdlib json is the fallback
+    orjson = None
+
+    def _dumps(value: Any) -> bytes:
+        return json.dumps(value).encode("utf-8")
+
+    _loads = json.loads
+
+DEFAULT_API_BASE = "https://api.parallel.ai"
 DEFAULT_SEARCH_BETA = "search-extract-2025-10-10"
+_EMPTY: tuple[Any, ...] = ()
+
+
+def print_json(value: Any) -> None:
+    """Pretty-print ``value`` as JSON; with orjson the encoded bytes go straight to stdout."""
+    buffer = getattr(sys.stdout, "buffer", None)
+    if orjson is None or buffer is None:
+        print(json.dumps(value, indent=2))
+        return
+    sys.stdout.flush()
+    buffer.write(orjson.dumps(value, option=orjson.OPT_INDENT_2))
+    buffer.write(b"\n")
 
 
 def post_json(url: str, api_key: str, payload: dict[str, Any], betas: list[str], timeout: float) -> tuple[int, Any]:
@@ -23,24 +49,24 @@ def post_json(url: str, api_key: str, payload: dict[str, Any], betas: list[str],
     }
     if betas:
         headers["parallel-beta"] = ",".join(betas)
-    req = urllib.request.Request(url, data=json.dumps(payload).encode("utf-8"), headers=headers, method="POST")
+    req = urllib.request.Request(url, data=_dumps(payload), headers=headers, method="POST")
     try:
         with urllib.request.urlopen(req, timeout=timeout) as resp:
-            body = resp.read().decode("utf-8")
-            return resp.getcode(), json.loads(body)
+            return resp.getcode(), _loads(resp.read())
     except urllib.error.HTTPError as e:
-        body = e.read().decode("utf-8", errors="replace")
+        body = e.read()
         try:
-            parsed = json.loads(body)
-        except json.JSONDecodeError:
-            parsed = {"raw": body}
+            parsed = _loads(body)
+        except ValueError:
+            parsed = {"raw": body.decode("utf-8", errors="replace")}
         return e.code, parsed
 
 
 def main() -> int:
     parser = argparse.ArgumentParser(description="Run a minimal Parallel Search API smoke test")
     parser.add_argument("--api-key", default=os.environ.get("PARALLEL_API_KEY"), help="Parallel API key (defaults to PARALLEL_API_KEY)")
-    parser.add_argument("--api-base", default=DEFAULT_API_BASE, help=f"API base URL (default: {DEFAULT_API_BASE})")
+    default_api_base = os.environ.get("PARALLEL_API_BASE_URL", DEFAULT_API_BASE)
+    parser.add_argument("--api-base", default=default_api_base, help=f"API base URL (default: {default_api_base})")
     parser.add_argument("--objective", default="What was the GDP of France in 2023?", help="Search objective")
     parser.add_argument("--mode", default="one-shot", choices=["one-shot", "agentic", "fast"], help="Search mode")
     parser.add_argument("--max-results", type=int, default=3, help="max_results")
@@ -79,22 +105,22 @@ def main() -> int:
     print(f"betas={','.join(betas)}")
 
     if args.raw:
-        print(json.dumps(resp, indent=2))
+        print_json(resp)
 
     if status != 200:
         print("Search smoke test failed")
         if not args.raw:
-            print(json.dumps(resp, indent=2))
+            print_json(resp)
         return 1
 
-    results = resp.get("results") or []
+    results = resp.get("results") or _EMPTY
     print(f"search_id={resp.get('search_id')}")
     print(f"result_count={len(results)}")
-    for i, item in enumerate(results[: min(5, len(results))], start=1):
+    for i, item in enumerate(islice(results, 5), start=1):
         print(f"{i}. {item.get('url')} | {item.get('publish_date')} | {item.get('title')}")
 
-    warnings = resp.get("warnings") or []
-    usage = resp.get("usage") or []
+    warnings = resp.get("warnings") or _EMPTY
+    usage = resp.get("usage") or _EMPTY
     print(f"warnings_count={len(warnings)} usage_items={len(usage)}")
     print("OK")
     return 0
@@ -4,19 +4,121 @@
 from __future__ import annotations
 
 import argparse
+import functools
+import http.client
 import json
 import os
 import sys
+import threading
 import time
 import urllib.error
 import urllib.parse
 import urllib.request
-from typing import Any, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator
 
-DEFAULT_API_BASE = os.environ.get("PARALLEL_API_BASE_URL", "https://api.parallel.ai")
+try:
+    import orjson
+
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:  # optional speedup; stdlib json is the fallback
+    orjson = None
+
+    def _dumps(value: Any) -> bytes:
+        return json.dumps(value).encode("utf-8")
+
+    _loads = json.loads
+
+DEFAULT_API_BASE = "https://api.parallel.ai"
 EVENTS_BETA = "events-sse-2025-07-24"
 
 
+# Keep-alive connections keyed by (scheme, netloc) so create/poll/result calls reuse one TLS session.
+# Held per thread: http.client connections are not safe to share between --batch workers.
+_LOCAL = threading.local()
+# Errors that mean a reused keep-alive connection had already been closed by the server.
+_STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+@functools.lru_cache(maxsize=None)
+def _uses_proxy(scheme: str, host: str) -> bool:
+    # getproxies() scans the environment, so decide once per host rather than once per request.
+    proxies = urllib.request.getproxies()
+    return scheme in proxies and not urllib.request.proxy_bypass(host)
+
+
+def _pooled_connection(parts: urllib.parse.SplitResult, timeout: float) -> http.client.HTTPConnection:
+    connections: dict[tuple[str, str], http.client.HTTPConnection] | None = getattr(_LOCAL, "connections", None)
+    if connections is None:
+        connections = _LOCAL.connections = {}
+    key = (parts.scheme, parts.netloc)
+    conn = connections.get(key)
+    if conn is None:
+        conn_cls = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        conn = conn_cls(parts.netloc, timeout=timeout)
+        connections[key] = conn
+    else:
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+    return conn
+
+
+def _send(
+    conn: http.client.HTTPConnection,
+    method: str,
+    target: str,
+    data: bytes | None,
+    headers: dict[str, str],
+) -> None:
+    try:
+        conn.request(method, target, body=data, headers=headers)
+    except Exception:
+        conn.close()
+        raise
+
+
+def _receive(conn: http.client.HTTPConnection) -> tuple[int, bytes]:
+    try:
+        resp = conn.getresponse()
+        return resp.status, resp.read()
+    except Exception:
+        conn.close()
+        raise
+
+
+def _parse_body(code: int, body: bytes) -> tuple[int, Any]:
+    if 200 <= code < 300:
+        return code, _loads(body) if body else None
+    try:
+        parsed = _loads(body)
+    except ValueError:  # also covers stdlib json rejecting non-UTF-8 bytes
+        parsed = {"raw": body.decode("utf-8", errors="replace")}
+    return code, parsed
+
+
+def _urlopen_json(method: str, url: str, headers: dict[str, str], data: bytes | None, timeout: float) -> tuple[int, Any]:
+    req = urllib.request.Request(url, data=data, headers=headers, method=method)
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            return _parse_body(resp.getcode(), resp.read())
+    except urllib.error.HTTPError as e:
+        return _parse_body(e.code, e.read())
+
+
+def build_headers(api_key: str, betas: list[str] | None) -> dict[str, str]:
+    headers = {
+        "x-api-key": api_key,
+        "content-type": "application/json",
+    }
+    if betas:
+        headers["parallel-beta"] = ",".join(betas)
+    return headers
+
+
 def http_json(
     method: str,
     url: str,
@@ -25,34 +127,133 @@ def http_json(
     payload: dict[str, Any] | None = None,
     betas: list[str] | None = None,
     timeout: float = 60.0,
+    headers: dict[str, str] | None = None,
 ) -> tuple[int, Any]:
-    headers = {
-        "x-api-key": api_key,
-        "content-type": "application/json",
-    }
-    if betas:
-        headers["parallel-beta"] = ",".join(betas)
-    data = None if payload is None else json.dumps(payload).encode("utf-8")
-    req = urllib.request.Request(url, data=data, headers=headers, method=method)
+    """Send one JSON request; pass ``headers`` from build_headers() to reuse them across calls."""
+    if headers is None:
+        headers = build_headers(api_key, betas)
+    data = None if payload is None else _dumps(payload)
+    parts = urllib.parse.urlsplit(url)
+    if _uses_proxy(parts.scheme, parts.hostname or ""):
+        # http.client does not speak to proxies; let urllib handle proxied environments.
+        return _urlopen_json(method, url, headers, data, timeout)
+
+    target = parts.path or "/"
+    if parts.query:
+        target += "?" + parts.query
+    conn = _pooled_connection(parts, timeout)
+    reused = conn.sock is not None
     try:
-        with urllib.request.urlopen(req, timeout=timeout) as resp:
-            body = resp.read().decode("utf-8")
-            parsed = json.loads(body) if body else None
-            return resp.getcode(), parsed
-    except urllib.error.HTTPError as e:
-        body = e.read().decode("utf-8", errors="replace")
-        try:
-            parsed = json.loads(body)
-        except json.JSONDecodeError:
-            parsed = {"raw": body}
-        return e.code, parsed
+        _send(conn, method, target, data, headers)
+    except _STALE_CONNECTION_ERRORS:
+        if not reused:
+            raise
+        # The server dropped the idle keep-alive connection before taking the request; resend once.
+        _send(conn, method, target, data, headers)
+        reused = False
+    try:
+        code, body = _receive(conn)
+    except _STALE_CONNECTION_ERRORS:
+        # The request went out, so the server may have acted on it: resending a create would start
+        # a second (billed) run. Only idempotent requests are retried on a fresh connection.
+        if not reused or method not in _IDEMPOTENT_METHODS:
+            raise
+        _send(conn, method, target, data, headers)
+        code, body = _receive(conn)
+    return _parse_body(code, body)
+
+
+def format_json(value: Any) -> str:
+    if orjson is None:
+        return json.dumps(value, indent=2)
+    return orjson.dumps(value, option=orjson.OPT_INDENT_2).decode("utf-8")
 
 
 def terminal_status(status: str | None) -> bool:
     return status in {"completed", "failed", "cancelled"}
 
 
+def iter_sse_events(lines: Iterable[bytes]) -> Iterator[tuple[str | None, str]]:
+    """Yield ``(event, data)`` pairs from raw ``text/event-stream`` lines."""
+    event: str | None = None
+    data: list[str] = []
+    for raw in lines:
+        line = raw.decode("utf-8", errors="replace").rstrip("\r\n")
+        if not line:
+            if data:
+                yield event, "\n".join(data)
+            event, data = None, []
+            continue
+        if line.startswith(":"):
+            continue
+        field, _, value = line.partition(":")
+        if value.startswith(" "):
+            value = value[1:]
+        if field == "event":
+            event = value
+        elif field == "data":
+            data.append(value)
+    if data:
+        yield event, "\n".join(data)
+
+
+def _lines_until(lines: Iterable[bytes], deadline: float) -> Iterator[bytes]:
+    # Checked per raw line, so keep-alive comments and partial events also end the stream on time.
+    for line in lines:
+        yield line
+        if time.time() > deadline:
+            return
+
+
+def follow_run_events(
+    url: str,
+    api_key: str,
+    betas: list[str],
+    *,
+    timeout: float,
+    deadline: float,
+    log: Callable[[str], None] = print,
+) -> str | None:
+    """Read the run's SSE stream until a terminal ``task_run.state`` event arrives.
+
+    Returns the terminal status, or None if the stream ended, errored, or hit the deadline first.
+    """
+    headers = {"x-api-key": api_key, "accept": "text/event-stream"}
+    if betas:
+        headers["parallel-beta"] = ",".join(betas)
+    req = urllib.request.Request(url, headers=headers, method="GET")
+    # Cap each read at the time left, so a silent stream times out by the deadline rather than http_timeout.
+    read_timeout = max(0.1, min(timeout, deadline - time.time()))
+    try:
+        with urllib.request.urlopen(req, timeout=read_timeout) as resp:
+            for event_type, data in iter_sse_events(_lines_until(resp, deadline)):
+                try:
+                    event = _loads(data)
+                except json.JSONDecodeError:
+                    continue
+                if not isinstance(event, dict):
+                    continue
+                kind = event.get("type") or event_type
+                if kind == "task_run.state":
+                    run = event.get("run") or {}
+                    status = run.get("status")
+                    log(f"run_status={status} is_active={run.get('is_active')}")
+                    if terminal_status(status):
+                        return status
+                elif kind == "error":
+                    log(f"event_error={data}")
+                    return None
+    except urllib.error.HTTPError as e:
+        log(f"events_status={e.code}")
+    except (urllib.error.URLError, OSError) as exc:
+        if time.time() <= deadline:
+            log(f"events_error={exc}")
+    return None
+
+
+@functools.lru_cache(maxsize=1)
 def build_task_spec() -> dict[str, Any]:
+    """Return the smoke-test TaskSpec (built once and shared; treat it as read-only)."""
     return {
         "output_schema": {
             "type": "json",
@@ -69,101 +270,162 @@ def build_task_spec() -> dict[str, Any]:
     }
 
 
-def main() -> int:
-    parser = argparse.ArgumentParser(description="Run a minimal Parallel Task API create/retrieve/result smoke test")
-    parser.add_argument("--api-key", default=os.environ.get("PARALLEL_API_KEY"), help="Parallel API key (defaults to PARALLEL_API_KEY)")
-    parser.add_argument("--api-base", default=DEFAULT_API_BASE, help=f"API base URL (default: {DEFAULT_API_BASE})")
-    parser.add_argument("--processor", default="base", help="Task processor")
-    parser.add_argument("--input", dest="task_input", default="What was the GDP of France in 2023?", help="Task input text")
-    parser.add_argument("--beta", action="append", default=[], help="parallel-beta value (repeatable)")
-    parser.add_argument("--enable-events", action="store_true", help="Set enable_events=true and add events beta header if needed")
-    parser.add_argument("--structured-output", action="store_true", help="Include a small TaskSpec JSON output schema")
-    parser.add_argument("--poll", action="store_true", help="Poll status endpoint before fetching result")
-    parser.add_argument("--poll-interval", type=float, default=2.0, help="Polling interval seconds")
-    parser.add_argument("--max-poll-seconds", type=float, default=120.0, help="Max total polling time")
-    parser.add_argument("--result-timeout", type=int, default=120, help="/result timeout query param seconds")
-    parser.add_argument("--http-timeout", type=float, default=60.0, help="Per-request network timeout seconds")
-    parser.add_argument("--raw", action="store_true", help="Print raw API responses")
-    args = parser.parse_args()
-
-    if not args.api_key:
-        print("SKIPPED: PARALLEL_API_KEY is not set (or pass --api-key)")
-        return 0
-
-    betas = list(args.beta)
+def run_task(args: argparse.Namespace, betas: list[str], task_input: str, log: Callable[[str], None] = print) -> int:
+    """Create one run, optionally wait for a terminal status, then fetch and summarize its result."""
     payload: dict[str, Any] = {
         "processor": args.processor,
-        "input": args.task_input,
+        "input": task_input,
     }
     if args.enable_events:
         payload["enable_events"] = True
-        if EVENTS_BETA not in betas:
-            betas.append(EVENTS_BETA)
     if args.structured_output:
         payload["task_spec"] = build_task_spec()
 
     base = args.api_base.rstrip("/")
+    # Create, every poll and the result fetch send identical headers; build them once per run.
+    headers = build_headers(args.api_key, betas)
     create_url = f"{base}/v1/tasks/runs"
-    status_code, create_resp = http_json("POST", create_url, args.api_key, payload=payload, betas=betas, timeout=args.http_timeout)
-    print(f"create_status={status_code}")
-    print(f"betas={','.join(betas) if betas else '(none)'}")
+    status_code, create_resp = http_json("POST", create_url, args.api_key, payload=payload, headers=headers, timeout=args.http_timeout)
+    log(f"create_status={status_code}")
+    log(f"betas={','.join(betas) if betas else '(none)'}")
     if args.raw:
-        print(json.dumps(create_resp, indent=2))
+        log(format_json(create_resp))
     if status_code != 202:
-        print("Task create smoke test failed")
+        log("Task create smoke test failed")
         if not args.raw:
-            print(json.dumps(create_resp, indent=2))
+            log(format_json(create_resp))
         return 1
 
     run_id = create_resp.get("run_id")
     if not run_id:
-        print("Task create response missing run_id")
+        log("Task create response missing run_id")
         return 1
-    print(f"run_id={run_id}")
+    log(f"run_id={run_id}")
 
     if args.poll:
+        deadline = time.time() + args.max_poll_seconds
+        terminal = None
+        if args.enable_events:
+            # One streamed request replaces the poll loop; fall back to polling if it yields no terminal state.
+            events_url = f"{base}/v1beta/tasks/runs/{urllib.parse.quote(run_id)}/events"
+            terminal = follow_run_events(events_url, args.api_key, betas, timeout=args.http_timeout, deadline=deadline, log=log)
+            if terminal is None:
+                log("Event stream ended without terminal status; falling back to polling")
         retrieve_url = f"{base}/v1/tasks/runs/{urllib.parse.quote(run_id)}"
-        start = time.time()
-        while True:
-            code, status_resp = http_json("GET", retrieve_url, args.api_key, betas=betas, timeout=args.http_timeout)
+        while terminal is None:
+            code, status_resp = http_json("GET", retrieve_url, args.api_key, headers=headers, timeout=args.http_timeout)
             if code != 200:
-                print(f"retrieve_status={code}")
-                print(json.dumps(status_resp, indent=2))
+                log(f"retrieve_status={code}")
+                log(format_json(status_resp))
                 return 1
             status = status_resp.get("status")
-            print(f"run_status={status} is_active={status_resp.get('is_active')}")
+            log(f"run_status={status} is_active={status_resp.get('is_active')}")
             if terminal_status(status):
                 break
-            if time.time() - start > args.max_poll_seconds:
-                print("Polling timed out before terminal status")
+            if time.time() > deadline:
+                log("Polling timed out before terminal status")
                 return 1
             time.sleep(args.poll_interval)
 
     result_url = f"{base}/v1/tasks/runs/{urllib.parse.quote(run_id)}/result?timeout={args.result_timeout}"
-    code, result_resp = http_json("GET", result_url, args.api_key, betas=betas, timeout=max(args.http_timeout, args.result_timeout + 5))
-    print(f"result_status={code}")
+    code, result_resp = http_json("GET", result_url, args.api_key, headers=headers, timeout=max(args.http_timeout, args.result_timeout + 5))
+    log(f"result_status={code}")
     if args.raw:
-        print(json.dumps(result_resp, indent=2))
+        log(format_json(result_resp))
     if code != 200:
-        print("Task result smoke test failed")
+        log("Task result smoke test failed")
         if not args.raw:
-            print(json.dumps(result_resp, indent=2))
+            log(format_json(result_resp))
         return 1
 
     run = (result_resp or {}).get("run") or {}
     output = (result_resp or {}).get("output") or {}
-    print(f"final_run_status={run.get('status')}")
-    print(f"output_type={output.get('type')}")
+    log(f"final_run_status={run.get('status')}")
+    log(f"output_type={output.get('type')}")
     content = output.get("content")
     if isinstance(content, (dict, list)):
-        print("output_content=" + json.dumps(content, ensure_ascii=False))
+        log("output_content=" + json.dumps(content, ensure_ascii=False))
     else:
-        print(f"output_content={content}")
+        log(f"output_content={content}")
     basis = output.get("basis") or []
-    print(f"basis_count={len(basis)}")
-    print("OK")
+    log(f"basis_count={len(basis)}")
+    log("OK")
     return 0
 
 
+def run_batch(args: argparse.Namespace, betas: list[str], inputs: list[str]) -> int:
+    """Run several create/wait/result flows concurrently and print each run's log in input order."""
+
+    def one(task_input: str) -> tuple[int, list[str]]:
+        lines: list[str] = []
+        try:
+            rc = run_task(args, betas, task_input, log=lines.append)
+        except Exception as exc:  # noqa: BLE001
+            lines.append(f"ERROR: {exc}")
+            rc = 1
+        return rc, lines
+
+    workers = max(1, min(args.concurrency, len(inputs)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(one, inputs))
+
+    failed = 0
+    for i, (rc, lines) in enumerate(results, start=1):
+        failed += rc != 0
+        for entry in lines:
+            for line in entry.splitlines():
+                print(f"[{i}] {line}")
+    print(f"batch_runs={len(results)} ok={len(results) - failed} failed={failed}")
+    return 1 if failed else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run a minimal Parallel Task API create/retrieve/result smoke test")
+    parser.add_argument("--api-key", default=os.environ.get("PARALLEL_API_KEY"), help="Parallel API key (defaults to PARALLEL_API_KEY)")
+    default_api_base = os.environ.get("PARALLEL_API_BASE_URL", DEFAULT_API_BASE)
+    parser.add_argument("--api-base", default=default_api_base, help=f"API base URL (default: {default_api_base})")
+    parser.add_argument("--processor", default="base", help="Task processor")
+    parser.add_argument("--input", dest="task_input", default="What was the GDP of France in 2023?", help="Task input text")
+    parser.add_argument("--beta", action="append", default=[], help="parallel-beta value (repeatable)")
+    parser.add_argument("--enable-events", action="store_true", help="Set enable_events=true and add events beta header if needed")
+    parser.add_argument("--structured-output", action="store_true", help="Include a small TaskSpec JSON output schema")
+    parser.add_argument(
+        "--poll",
+        action="store_true",
+        help="Wait for a terminal status before fetching result (uses the SSE events stream with --enable-events)",
+    )
+    parser.add_argument("--poll-interval", type=float, default=2.0, help="Polling interval seconds")
+    parser.add_argument("--max-poll-seconds", type=float, default=120.0, help="Max total polling time")
+    parser.add_argument("--result-timeout", type=int, default=120, help="/result timeout query param seconds")
+    parser.add_argument("--http-timeout", type=float, default=60.0, help="Per-request network timeout seconds")
+    parser.add_argument("--raw", action="store_true", help="Print raw API responses")
+    parser.add_argument("--batch", type=int, default=1, help="Create this many runs of --input concurrently")
+    parser.add_argument("--inputs", help="File with one task input per line; runs them concurrently (overrides --batch)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Max concurrent runs for --batch/--inputs")
+    args = parser.parse_args()
+
+    if not args.api_key:
+        print("SKIPPED: PARALLEL_API_KEY is not set (or pass --api-key)")
+        return 0
+
+    betas = list(args.beta)
+    if args.enable_events and EVENTS_BETA not in betas:
+        betas.append(EVENTS_BETA)
+
+    if args.inputs:
+        try:
+            inputs = [line.strip() for line in Path(args.inputs).read_text().splitlines() if line.strip()]
+        except OSError as exc:
+            print(f"ERROR: failed to read --inputs: {exc}", file=sys.stderr)
+            return 2
+        if not inputs:
+            print("ERROR: --inputs file contains no task inputs", file=sys.stderr)
+            return 2
+        return run_batch(args, betas, inputs)
+    if args.batch > 1:
+        return run_batch(args, betas, [args.task_input] * args.batch)
+    return run_task(args, betas, args.task_input)
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
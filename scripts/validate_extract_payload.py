@@ -4,19 +4,17 @@
 from __future__ import annotations
 
 import argparse
-import json
 import sys
-from pathlib import Path
 from typing import Any, List, Set
-from urllib.parse import urlparse
-
-REQUIRED_BETA = "search-extract-2025-10-10"
+from urllib.parse import urlsplit
 
+from _shared_validators import FailFastErrors, StopValidation, load_json, print_report, validate_many
 
-def load_json(path: str) -> Any:
-    if path == "-":
-        return json.load(sys.stdin)
-    return json.loads(Path(path).read_text())
+REQUIRED_BETA = "search-extract-2025-10-10"
+_HTTP_SCHEMES = frozenset({"http", "https"})
+_KNOWN_FIELDS: frozenset[str] = frozenset(
+    {"urls", "objective", "search_queries", "fetch_policy", "excerpts", "full_content"}
+)
 
 
 def add_error(errors: List[str], path: str, msg: str) -> None:
@@ -28,11 +26,12 @@ def add_warning(warnings: List[str], path: str, msg: str) -> None:
 
 
 def is_http_url(value: str) -> bool:
+    # urlsplit skips urlparse's ;params pass, which is irrelevant for scheme/netloc.
     try:
-        parsed = urlparse(value)
-    except Exception:  # noqa: BLE001
+        parsed = urlsplit(value)
+    except ValueError:
         return False
-    return parsed.scheme in {"http", "https"} and bool(parsed.netloc)
+    return parsed.scheme in _HTTP_SCHEMES and bool(parsed.netloc)
 
 
 def validate_fetch_policy(value: Any, errors: List[str], warnings: List[str], path: str) -> None:
@@ -84,13 +83,21 @@ def validate_full_content_settings(value: Any, errors: List[str], warnings: List
             add_error(errors, f"{path}.max_chars_per_result", "must be > 0")
 
 
-def validate(payload: Any, betas: Set[str]) -> tuple[list[str], list[str]]:
-    errors: list[str] = []
+def validate(payload: Any, betas: Set[str], fail_fast: bool = False) -> tuple[list[str], list[str]]:
+    """Validate an ExtractRequest; with ``fail_fast`` stop at the first error."""
+    errors: list[str] = FailFastErrors() if fail_fast else []
     warnings: list[str] = []
+    try:
+        _validate_payload(payload, betas, errors, warnings)
+    except StopValidation:
+        pass
+    return list(errors), warnings
 
+
+def _validate_payload(payload: Any, betas: Set[str], errors: List[str], warnings: List[str]) -> None:
     if not isinstance(payload, dict):
         add_error(errors, "$", "payload must be a JSON object")
-        return errors, warnings
+        return
 
     urls = payload.get("urls")
     if urls is None:
@@ -101,17 +108,18 @@ def validate(payload: Any, betas: Set[str]) -> tuple[list[str], list[str]]:
         if len(urls) == 0:
             add_error(errors, "$.urls", "must not be empty")
         seen = set()
+        # Path strings are only formatted when a message is actually emitted.
         for i, url in enumerate(urls):
-            path = f"$.urls[{i}]"
-            if not isinstance(url, str):
-                add_error(errors, path, "must be a string")
-                continue
-            if not is_http_url(url):
-                add_error(errors, path, "must be an absolute http/https URL")
-                continue
-            if url in seen:
-                add_warning(warnings, path, "duplicate URL")
-            seen.add(url)
+            if isinstance(url, str) and is_http_url(url):
+                # A single add() plus a size check detects duplicates with one hash lookup.
+                seen_count = len(seen)
+                seen.add(url)
+                if len(seen) == seen_count:
+                    add_warning(warnings, f"$.urls[{i}]", "duplicate URL")
+            elif not isinstance(url, str):
+                add_error(errors, f"$.urls[{i}]", "must be a string")
+            else:
+                add_error(errors, f"$.urls[{i}]", "must be an absolute http/https URL")
 
     objective = payload.get("objective")
     if objective is not None:
@@ -171,17 +179,31 @@ def validate(payload: Any, betas: Set[str]) -> tuple[list[str], list[str]]:
             f"Extract API is beta; include parallel-beta '{REQUIRED_BETA}' (current docs/OpenAPI)",
         )
 
-    known = {"urls", "objective", "search_queries", "fetch_policy", "excerpts", "full_content"}
-    for key in payload.keys():
-        if key not in known:
-            add_warning(warnings, f"$.{key}", "unknown field for current ExtractRequest snapshot")
+    # Subset test on the key view first; only walk keys (in payload order) when something is unknown.
+    if not payload.keys() <= _KNOWN_FIELDS:
+        for key in payload:
+            if key not in _KNOWN_FIELDS:
+                add_warning(warnings, f"$.{key}", "unknown field for current ExtractRequest snapshot")
 
-    return errors, warnings
+
+def validate_file(path: str, betas: Set[str], fail_fast: bool = False) -> tuple[str, list[str], list[str], str | None]:
+    """Load and validate one payload file; returns ``(path, errors, warnings, read_error)``."""
+    try:
+        payload = load_json(path)
+    except Exception as exc:  # noqa: BLE001
+        return path, [], [], f"failed to read JSON: {exc}"
+    errors, warnings = validate(payload, betas, fail_fast)
+    return path, errors, warnings, None
 
 
 def main() -> int:
-    parser = argparse.ArgumentParser(description="Validate a Parallel Extract API request payload")
-    parser.add_argument("json_file", nargs="?", default="-", help="JSON file path or '-' for stdin")
+    parser = argparse.ArgumentParser(description="Validate Parallel Extract API request payload(s)")
+    parser.add_argument(
+        "json_file",
+        nargs="*",
+        default=["-"],
+        help="JSON file path(s), or '-' for stdin (default). Multiple files are validated in one run",
+    )
     parser.add_argument(
         "--beta",
         action="append",
@@ -189,8 +211,12 @@ def main() -> int:
         help="parallel-beta value(s) used with the request (repeatable or comma-separated)",
     )
     parser.add_argument("--strict", action="store_true", help="Treat warnings as failures")
+    parser.add_argument("--fail-fast", action="store_true", help="Stop validating a payload at its first error")
     args = parser.parse_args()
 
+    if len(args.json_file) > 1 and "-" in args.json_file:
+        parser.error("'-' (stdin) cannot be combined with other files")
+
     betas: Set[str] = set()
     for item in args.beta:
         for part in item.split(","):
@@ -198,29 +224,23 @@ def main() -> int:
             if part:
                 betas.add(part)
 
+    header = ["Parallel Extract payload validation"]
+    if betas:
+        header.append("betas=" + ",".join(sorted(betas)))
+    if len(args.json_file) > 1:
+        return validate_many(args.json_file, validate_file, (betas, args.fail_fast), header, args.strict)
+
     try:
-        payload = load_json(args.json_file)
+        payload = load_json(args.json_file[0])
     except Exception as exc:  # noqa: BLE001
         print(f"ERROR: failed to read JSON: {exc}", file=sys.stderr)
         return 2
 
-    errors, warnings = validate(payload, betas)
+    errors, warnings = validate(payload, betas, args.fail_fast)
 
-    print("Parallel Extract payload validation")
-    if betas:
-        print("betas=" + ",".join(sorted(betas)))
-    print(f"errors={len(errors)} warnings={len(warnings)}")
-    for msg in errors:
-        print(f"ERROR  {msg}")
-    for msg in warnings:
-        print(f"WARN   {msg}")
-
-    if errors:
-        return 1
-    if args.strict and warnings:
-        return 1
-    print("OK")
-    return 0
+    for line in header:
+        print(line)
+    return print_report(errors, warnings, args.strict)
 
 
 if __name__ == "__main__":
@@ -4,14 +4,20 @@
 from __future__ import annotations
 
 import argparse
-import json
 import sys
-from datetime import date
-from pathlib import Path
 from typing import Any, List
-from urllib.parse import urlparse
 
-ALLOWED_MODES = {"one-shot", "agentic", "fast"}
+from _shared_validators import (
+    FailFastErrors,
+    StopValidation,
+    check_domain_list,
+    is_iso_date,
+    load_json,
+    print_report,
+    validate_many,
+)
+
+ALLOWED_MODES = frozenset({"one-shot", "agentic", "fast"})
 MAX_RESULTS_DOCS = 20
 MAX_QUERIES_DOCS = 5
 MAX_OBJECTIVE_CHARS_DOCS = 5000
@@ -19,12 +25,6 @@ MAX_QUERY_CHARS_DOCS = 200
 MAX_DOMAIN_LIST_ITEMS_DOCS = 10
 
 
-def load_json(path: str) -> Any:
-    if path == "-":
-        return json.load(sys.stdin)
-    return json.loads(Path(path).read_text())
-
-
 def add_error(errors: List[str], path: str, msg: str) -> None:
     errors.append(f"{path}: {msg}")
 
@@ -33,29 +33,21 @@ def add_warning(warnings: List[str], path: str, msg: str) -> None:
     warnings.append(f"{path}: {msg}")
 
 
-def is_domain_selector(value: str) -> bool:
-    if not isinstance(value, str) or not value:
-        return False
-    if "/" in value:
-        return False
-    if "://" in value:
-        return False
-    if value.startswith("."):
-        return len(value) > 1 and " " not in value
-    # Simple domain-ish check; allow subdomains and hyphens.
-    if " " in value or "." not in value:
-        return False
-    parsed = urlparse("//" + value)
-    return bool(parsed.hostname) and parsed.hostname == value.lower()
-
-
-def validate(payload: Any) -> tuple[list[str], list[str]]:
-    errors: list[str] = []
+def validate(payload: Any, fail_fast: bool = False) -> tuple[list[str], list[str]]:
+    """Validate a Search request; with ``fail_fast`` stop at the first error."""
+    errors: list[str] = FailFastErrors() if fail_fast else []
     warnings: list[str] = []
+    try:
+        _validate_payload(payload, errors, warnings)
+    except StopValidation:
+        pass
+    return list(errors), warnings
 
+
+def _validate_payload(payload: Any, errors: List[str], warnings: List[str]) -> None:
     if not isinstance(payload, dict):
         add_error(errors, "$", "payload must be a JSON object")
-        return errors, warnings
+        return
 
     if "processor" in payload:
         add_warning(warnings, "$.processor", "deprecated in Search API; prefer $.mode")
@@ -96,16 +88,15 @@ def validate(payload: Any) -> tuple[list[str], list[str]]:
                     f"{len(search_queries)} queries exceeds docs guidance ({MAX_QUERIES_DOCS})",
                 )
             for i, q in enumerate(search_queries):
-                path = f"$.search_queries[{i}]"
                 if not isinstance(q, str):
-                    add_error(errors, path, "must be a string")
+                    add_error(errors, f"$.search_queries[{i}]", "must be a string")
                     continue
                 if not q.strip():
-                    add_error(errors, path, "must not be empty")
+                    add_error(errors, f"$.search_queries[{i}]", "must not be empty")
                 if len(q) > MAX_QUERY_CHARS_DOCS:
                     add_warning(
                         warnings,
-                        path,
+                        f"$.search_queries[{i}]",
                         f"length {len(q)} exceeds docs guidance ({MAX_QUERY_CHARS_DOCS} chars)",
                     )
 
@@ -156,37 +147,21 @@ def validate(payload: Any) -> tuple[list[str], list[str]]:
         else:
             for key in ("include_domains", "exclude_domains"):
                 arr = source_policy.get(key)
-                if arr is None:
-                    continue
-                if not isinstance(arr, list):
-                    add_error(errors, f"$.source_policy.{key}", "must be an array of domain selectors")
-                    continue
-                if len(arr) > MAX_DOMAIN_LIST_ITEMS_DOCS:
-                    add_warning(
-                        warnings,
+                if arr is not None:
+                    check_domain_list(
+                        arr,
                         f"$.source_policy.{key}",
-                        f"{len(arr)} entries exceeds docs guidance ({MAX_DOMAIN_LIST_ITEMS_DOCS})",
+                        lambda p, m: add_error(errors, p, m),
+                        lambda p, m: add_warning(warnings, p, m),
+                        MAX_DOMAIN_LIST_ITEMS_DOCS,
                     )
-                for i, item in enumerate(arr):
-                    path = f"$.source_policy.{key}[{i}]"
-                    if not isinstance(item, str):
-                        add_error(errors, path, "must be a string")
-                    elif not is_domain_selector(item):
-                        add_error(
-                            errors,
-                            path,
-                            "must be a plain domain, subdomain, or bare extension like '.gov' (no scheme/path)",
-                        )
 
             after_date = source_policy.get("after_date")
             if after_date is not None:
                 if not isinstance(after_date, str):
                     add_error(errors, "$.source_policy.after_date", "must be YYYY-MM-DD string")
-                else:
-                    try:
-                        date.fromisoformat(after_date)
-                    except ValueError:
-                        add_error(errors, "$.source_policy.after_date", "must be valid YYYY-MM-DD")
+                elif not is_iso_date(after_date):
+                    add_error(errors, "$.source_policy.after_date", "must be valid YYYY-MM-DD")
 
     fetch_policy = payload.get("fetch_policy")
     if fetch_policy is not None:
@@ -213,36 +188,53 @@ def validate(payload: Any) -> tuple[list[str], list[str]]:
             if dcf is not None and not isinstance(dcf, bool):
                 add_error(errors, "$.fetch_policy.disable_cache_fallback", "must be a boolean")
 
-    return errors, warnings
+
+def validate_file(path: str, fail_fast: bool = False) -> tuple[str, list[str], list[str], str | None]:
+    """Load and validate one payload file; returns ``(path, errors, warnings, read_error)``."""
+    try:
+        payload = load_json(path)
+    except Exception as exc:  # noqa: BLE001
+        return path, [], [], f"failed to read JSON: {exc}"
+    errors, warnings = validate(payload, fail_fast)
+    return path, errors, warnings, None
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Validate Parallel Search API request payload(s)")
+    parser.add_argument(
+        "json_file",
+        nargs="*",
+        default=["-"],
+        help="JSON file path(s), or '-' for stdin (default). Multiple files are validated in one run",
+    )
+    parser.add_argument("--strict", action="store_true", help="Treat warnings as failures")
+    parser.add_argument("--fail-fast", action="store_true", help="Stop validating a payload at its first error")
+    return parser
+
+
+_PARSER = _build_parser()
 
 
 def main() -> int:
-    parser = argparse.ArgumentParser(description="Validate a Parallel Search API request payload")
-    parser.add_argument("json_file", nargs="?", default="-", help="JSON file path or '-' for stdin")
-    parser.add_argument("--strict", action="store_true", help="Treat warnings as failures")
-    args = parser.parse_args()
+    args = _PARSER.parse_args()
+
+    if len(args.json_file) > 1 and "-" in args.json_file:
+        _PARSER.error("'-' (stdin) cannot be combined with other files")
+    header = ["Parallel Search payload validation"]
+    if len(args.json_file) > 1:
+        return validate_many(args.json_file, validate_file, (args.fail_fast,), header, args.strict)
 
     try:
-        payload = load_json(args.json_file)
+        payload = load_json(args.json_file[0])
     except Exception as exc:  # noqa: BLE001
         print(f"ERROR: failed to read JSON: {exc}", file=sys.stderr)
         return 2
 
-    errors, warnings = validate(payload)
-
-    print("Parallel Search payload validation")
-    print(f"errors={len(errors)} warnings={len(warnings)}")
-    for msg in errors:
-        print(f"ERROR  {msg}")
-    for msg in warnings:
-        print(f"WARN   {msg}")
-
-    if errors:
-        return 1
-    if args.strict and warnings:
-        return 1
-    print("OK")
-    return 0
+    errors, warnings = validate(payload, args.fail_fast)
+
+    for line in header:
+        print(line)
+    return print_report(errors, warnings, args.strict)
 
 
 if __name__ == "__main__":
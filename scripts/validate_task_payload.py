@@ -6,32 +6,41 @@ from __future__ import annotations
 import argparse
 import json
 import sys
-from datetime import date
-from pathlib import Path
-from typing import Any, Iterable, List, Set
-
-KNOWN_PROCESSORS = {
-    # Current docs families (2026-02 snapshot) plus a few older names for compatibility warnings.
-    "lite",
-    "base",
-    "core",
-    "core2x",
-    "pro",
-    "ultra",
-    "ultra2x",
-    "ultra4x",
-    "ultra8x",
-    "base-fast",
-    "core-fast",
-    "pro-fast",
-    "vision",
-    "vision_pro",
-    "deep",
-    "deepv2",
-    # Legacy/older names seen in examples or prior docs
-    "fast",
-    "nano",
-}
+from typing import Any, Callable, Iterable, List, Set
+
+from _shared_validators import (
+    StopValidation,
+    check_domain_list,
+    is_iso_date,
+    load_json,
+    print_report,
+    validate_many,
+)
+
+KNOWN_PROCESSORS = frozenset(
+    {
+        # Current docs families (2026-02 snapshot) plus a few older names for compatibility warnings.
+        "lite",
+        "base",
+        "core",
+        "core2x",
+        "pro",
+        "ultra",
+        "ultra2x",
+        "ultra4x",
+        "ultra8x",
+        "base-fast",
+        "core-fast",
+        "pro-fast",
+        "vision",
+        "vision_pro",
+        "deep",
+        "deepv2",
+        # Legacy/older names seen in examples or prior docs
+        "fast",
+        "nano",
+    }
+)
 
 BETA_REQUIREMENTS = {
     "enable_events": "events-sse-2025-07-24",
@@ -39,42 +48,68 @@ BETA_REQUIREMENTS = {
     "webhook": "webhook-2025-08-12",
 }
 
-TASK_STATUSES = {
-    "queued",
-    "action_required",
-    "running",
-    "completed",
-    "failed",
-    "cancelling",
-    "cancelled",
+# Beta gates as bits, so each gated field tests an int instead of looking up a header string.
+_BETA_EVENTS = 1
+_BETA_MCP_SERVERS = 2
+_BETA_WEBHOOK = 4
+_BETA_BITS = {
+    BETA_REQUIREMENTS["enable_events"]: _BETA_EVENTS,
+    BETA_REQUIREMENTS["mcp_servers"]: _BETA_MCP_SERVERS,
+    BETA_REQUIREMENTS["webhook"]: _BETA_WEBHOOK,
 }
 
-UNSUPPORTED_JSON_SCHEMA_KEYWORDS = {
-    "anyOf",
-    "oneOf",
-    "allOf",
-    "not",
-    "if",
-    "then",
-    "else",
-    "dependentSchemas",
-    "dependentRequired",
-    "patternProperties",
-}
+TASK_STATUSES = frozenset(
+    {
+        "queued",
+        "action_required",
+        "running",
+        "completed",
+        "failed",
+        "cancelling",
+        "cancelled",
+    }
+)
+
+UNSUPPORTED_JSON_SCHEMA_KEYWORDS = frozenset(
+    {
+        "anyOf",
+        "oneOf",
+        "allOf",
+        "not",
+        "if",
+        "then",
+        "else",
+        "dependentSchemas",
+        "dependentRequired",
+        "patternProperties",
+    }
+)
 
 TASK_SPEC_SIZE_LIMIT = 15000
 COMBINED_TASK_SPEC_INPUT_LIMIT = 18000
 JSON_SCHEMA_PROPERTY_LIMIT = 100
 JSON_SCHEMA_DEPTH_LIMIT = 5
+MAX_DOMAIN_LIST_ITEMS_DOCS = 10
+
+# json.loads only produces exact built-in types, so the per-item checks below compare
+# type(x) directly instead of paying for isinstance() subclass resolution. JSON true/false
+# load as bool, which the metadata value check accepts alongside int/float anyway.
+_SCALAR_TYPES = frozenset({str, int, float, bool})
+
+# Keys that mark a bare object as a plain JSON Schema rather than a text-schema wrapper.
+_SCHEMA_MARKER_KEYS = frozenset({"properties", "items", "required", "additionalProperties"})
 
 
 class Collector:
-    def __init__(self) -> None:
+    def __init__(self, fail_fast: bool = False) -> None:
         self.errors: List[str] = []
         self.warnings: List[str] = []
+        self._fail_fast = fail_fast
 
     def error(self, path: str, msg: str) -> None:
         self.errors.append(f"{path}: {msg}")
+        if self._fail_fast:
+            raise StopValidation
 
     def warn(self, path: str, msg: str) -> None:
         self.warnings.append(f"{path}: {msg}")
@@ -86,37 +121,55 @@ class SchemaStats:
         self.max_depth = 0
 
 
-def load_json(path: str) -> Any:
-    if path == "-":
-        return json.load(sys.stdin)
-    return json.loads(Path(path).read_text())
+class _SizeLimitExceeded(Exception):
+    pass
+
+
+class _LenSink:
+    """Write-only file object that counts characters instead of storing them."""
+
+    def __init__(self, limit: int) -> None:
+        self.n = 0
+        self.limit = limit
+
+    def write(self, s: str) -> int:
+        # Stop on the write after the one that crossed the limit: if the encoder finishes first,
+        # the count is still exact.
+        if self.n > self.limit:
+            raise _SizeLimitExceeded
+        self.n += len(s)
+        return len(s)
 
 
 def json_size(value: Any) -> int:
+    """Return the compact, ASCII-escaped serialized JSON size of ``value`` in characters."""
+    # Always the stdlib encoder: orjson formats floats differently (1e100 vs 1e+100, NaN as null),
+    # so its byte count would depend on which backend is installed.
     return len(json.dumps(value, separators=(",", ":"), ensure_ascii=True))
 
 
+def json_size_capped(value: Any, limit: int) -> tuple[int, bool]:
+    """Like ``json_size``, but give up once the count is known to exceed ``limit``.
+
+    The encoder output is streamed into a counter, so an oversized value is never fully
+    serialized. Returns ``(count, truncated)``; when ``truncated`` the count is only a lower bound.
+    """
+    sink = _LenSink(limit)
+    try:
+        json.dump(value, sink, separators=(",", ":"), ensure_ascii=True)
+    except _SizeLimitExceeded:
+        return sink.n, True
+    return sink.n, False
+
+
 def validate_source_policy(sp: Any, c: Collector, path: str, allow_after_date: bool) -> None:
     if not isinstance(sp, dict):
         c.error(path, "must be an object")
         return
     for key in ("include_domains", "exclude_domains"):
         arr = sp.get(key)
-        if arr is None:
-            continue
-        if not isinstance(arr, list):
-            c.error(f"{path}.{key}", "must be an array of strings")
-            continue
-        if len(arr) > 10:
-            c.warn(f"{path}.{key}", "docs guidance is max 10 entries")
-        for i, item in enumerate(arr):
-            if not isinstance(item, str):
-                c.error(f"{path}.{key}[{i}]", "must be a string")
-            elif "://" in item or "/" in item or " " in item or "." not in item and not item.startswith("."):
-                c.error(
-                    f"{path}.{key}[{i}]",
-                    "must be a plain domain, subdomain, or bare extension like '.gov'",
-                )
+        if arr is not None:
+            check_domain_list(arr, f"{path}.{key}", c.error, c.warn, MAX_DOMAIN_LIST_ITEMS_DOCS)
     if "after_date" in sp:
         if not allow_after_date:
             c.warn(f"{path}.after_date", "Task source policy does not currently support after_date")
@@ -124,26 +177,23 @@ def validate_source_policy(sp: Any, c: Collector, path: str, allow_after_date: b
         if val is not None:
             if not isinstance(val, str):
                 c.error(f"{path}.after_date", "must be YYYY-MM-DD string")
-            else:
-                try:
-                    date.fromisoformat(val)
-                except ValueError:
-                    c.error(f"{path}.after_date", "must be valid YYYY-MM-DD")
+            elif not is_iso_date(val):
+                c.error(f"{path}.after_date", "must be valid YYYY-MM-DD")
 
 
 def validate_metadata(meta: Any, c: Collector, path: str) -> None:
     if meta is None:
         return
-    if not isinstance(meta, dict):
+    if type(meta) is not dict:
         c.error(path, "must be an object")
         return
     for k, v in meta.items():
-        if not isinstance(k, str):
+        if type(k) is not str:
             c.error(path, "all metadata keys must be strings")
             continue
         if len(k) > 16:
             c.warn(f"{path}.{k}", "key length exceeds 16 (OpenAPI docs note a short-key limit)")
-        if not isinstance(v, (str, int, float, bool)):
+        if type(v) not in _SCALAR_TYPES:
             c.error(f"{path}.{k}", "value must be string/number/integer/boolean")
             continue
         if len(str(v)) > 512:
@@ -153,46 +203,46 @@ def validate_metadata(meta: Any, c: Collector, path: str) -> None:
 def validate_mcp_servers(value: Any, c: Collector, path: str) -> None:
     if value is None:
         return
-    if not isinstance(value, list):
+    if type(value) is not list:
         c.error(path, "must be an array")
         return
     for i, item in enumerate(value):
         p = f"{path}[{i}]"
-        if not isinstance(item, dict):
+        if type(item) is not dict:
             c.error(p, "must be an object")
             continue
-        if "url" not in item or not isinstance(item.get("url"), str) or not item["url"]:
+        if "url" not in item or type(item.get("url")) is not str or not item["url"]:
             c.error(f"{p}.url", "is required and must be a non-empty string")
-        if "name" not in item or not isinstance(item.get("name"), str) or not item["name"]:
+        if "name" not in item or type(item.get("name")) is not str or not item["name"]:
             c.error(f"{p}.name", "is required and must be a non-empty string")
         t = item.get("type")
         if t is not None and t != "url":
             c.warn(f"{p}.type", "OpenAPI currently documents MCP server type as constant 'url'")
         headers = item.get("headers")
-        if headers is not None and not isinstance(headers, dict):
+        if headers is not None and type(headers) is not dict:
             c.error(f"{p}.headers", "must be an object mapping header names to strings")
-        elif isinstance(headers, dict):
+        elif type(headers) is dict:
             for hk, hv in headers.items():
-                if not isinstance(hk, str) or not isinstance(hv, str):
+                if type(hk) is not str or type(hv) is not str:
                     c.error(f"{p}.headers", "header keys and values must be strings")
                     break
         allowed_tools = item.get("allowed_tools")
         if allowed_tools is not None:
-            if not isinstance(allowed_tools, list) or not all(isinstance(x, str) for x in allowed_tools):
+            if type(allowed_tools) is not list or not all(type(x) is str for x in allowed_tools):
                 c.error(f"{p}.allowed_tools", "must be an array of strings")
 
 
 def validate_webhook(value: Any, c: Collector, path: str) -> None:
     if value is None:
         return
-    if not isinstance(value, dict):
+    if type(value) is not dict:
         c.error(path, "must be an object")
         return
-    if "url" not in value or not isinstance(value.get("url"), str) or not value["url"]:
+    if "url" not in value or type(value.get("url")) is not str or not value["url"]:
         c.error(f"{path}.url", "is required and must be a non-empty string")
     event_types = value.get("event_types")
     if event_types is not None:
-        if not isinstance(event_types, list) or not all(isinstance(x, str) for x in event_types):
+        if type(event_types) is not list or not all(type(x) is str for x in event_types):
             c.error(f"{path}.event_types", "must be an array of strings")
         else:
             for i, item in enumerate(event_types):
@@ -209,76 +259,64 @@ def validate_json_schema_node(
     warn_on_unsupported_keywords: bool,
     strict_additional_properties_hint: bool,
 ) -> None:
-    if depth > stats.max_depth:
-        stats.max_depth = depth
-    if depth > JSON_SCHEMA_DEPTH_LIMIT:
-        c.error(path, f"nesting depth exceeds docs guidance ({JSON_SCHEMA_DEPTH_LIMIT})")
-
-    if not isinstance(node, dict):
-        return
-
-    for key in node.keys():
-        if key in UNSUPPORTED_JSON_SCHEMA_KEYWORDS:
-            msg = f"contains unsupported JSON Schema keyword '{key}' per Task docs guidance"
-            if warn_on_unsupported_keywords:
-                c.warn(path, msg)
-            else:
-                c.error(path, msg)
-
-    node_type = node.get("type")
-    if node_type == "object":
-        props = node.get("properties")
-        if props is not None:
-            if not isinstance(props, dict):
-                c.error(f"{path}.properties", "must be an object")
-            else:
-                stats.property_count += len(props)
-                if stats.property_count > JSON_SCHEMA_PROPERTY_LIMIT:
-                    c.error(
-                        path,
-                        f"total JSON schema properties exceed docs guidance ({JSON_SCHEMA_PROPERTY_LIMIT})",
-                    )
-                for name, sub in props.items():
-                    if not isinstance(name, str):
-                        c.error(f"{path}.properties", "property names must be strings")
-                        continue
-                    validate_json_schema_node(
-                        sub,
-                        c,
-                        f"{path}.properties.{name}",
-                        stats,
-                        depth + 1,
-                        warn_on_unsupported_keywords,
-                        strict_additional_properties_hint,
-                    )
-        if strict_additional_properties_hint and node.get("additionalProperties") is not False:
-            c.warn(path, "set additionalProperties=false for more stable Task outputs")
-
-        req = node.get("required")
-        if req is not None and (not isinstance(req, list) or not all(isinstance(x, str) for x in req)):
-            c.error(f"{path}.required", "must be an array of strings")
-
-    if isinstance(node.get("items"), dict):
-        validate_json_schema_node(
-            node["items"],
-            c,
-            f"{path}.items",
-            stats,
-            depth + 1,
-            warn_on_unsupported_keywords,
-            strict_additional_properties_hint,
-        )
+    # Iterative pre-order walk: children are pushed in reverse so they pop in document order,
+    # and a deeply nested schema cannot hit the interpreter recursion limit.
+    stack: list[tuple[Any, str, int]] = [(node, path, depth)]
+    while stack:
+        node, path, depth = stack.pop()
+        stats.max_depth = max(stats.max_depth, depth)
+        if depth > JSON_SCHEMA_DEPTH_LIMIT:
+            c.error(path, f"nesting depth exceeds docs guidance ({JSON_SCHEMA_DEPTH_LIMIT})")
+
+        if not isinstance(node, dict):
+            continue
 
-    if isinstance(node.get("additionalProperties"), dict):
-        validate_json_schema_node(
-            node["additionalProperties"],
-            c,
-            f"{path}.additionalProperties",
-            stats,
-            depth + 1,
-            warn_on_unsupported_keywords,
-            strict_additional_properties_hint,
-        )
+        # One C-level disjointness test per node; only nodes that actually use an
+        # unsupported keyword pay for the per-key scan that builds the messages.
+        if not UNSUPPORTED_JSON_SCHEMA_KEYWORDS.isdisjoint(node):
+            for key in node:
+                if key in UNSUPPORTED_JSON_SCHEMA_KEYWORDS:
+                    msg = f"contains unsupported JSON Schema keyword '{key}' per Task docs guidance"
+                    if warn_on_unsupported_keywords:
+                        c.warn(path, msg)
+                    else:
+                        c.error(path, msg)
+
+        children: list[tuple[Any, str, int]] = []
+        node_type = node.get("type")
+        if node_type == "object":
+            props = node.get("properties")
+            if props is not None:
+                if not isinstance(props, dict):
+                    c.error(f"{path}.properties", "must be an object")
+                else:
+                    stats.property_count += len(props)
+                    if stats.property_count > JSON_SCHEMA_PROPERTY_LIMIT:
+                        c.error(
+                            path,
+                            f"total JSON schema properties exceed docs guidance ({JSON_SCHEMA_PROPERTY_LIMIT})",
+                        )
+                    prop_prefix = path + ".properties."
+                    for name, sub in props.items():
+                        if not isinstance(name, str):
+                            c.error(f"{path}.properties", "property names must be strings")
+                            continue
+                        children.append((sub, prop_prefix + name, depth + 1))
+            if strict_additional_properties_hint and node.get("additionalProperties") is not False:
+                c.warn(path, "set additionalProperties=false for more stable Task outputs")
+
+            req = node.get("required")
+            if req is not None and (not isinstance(req, list) or not all(isinstance(x, str) for x in req)):
+                c.error(f"{path}.required", "must be an array of strings")
+
+        if isinstance(node.get("items"), dict):
+            children.append((node["items"], f"{path}.items", depth + 1))
+
+        if isinstance(node.get("additionalProperties"), dict):
+            children.append((node["additionalProperties"], f"{path}.additionalProperties", depth + 1))
+
+        children.reverse()
+        stack.extend(children)
 
 
 def extract_json_schema_descriptor(value: Any, c: Collector, path: str, is_output_schema: bool) -> None:
@@ -310,7 +348,7 @@ def extract_json_schema_descriptor(value: Any, c: Collector, path: str, is_outpu
     elif schema_type in ("text", None):
         # Could be a text schema wrapper or a plain JSON Schema object.
         # Heuristically treat objects with JSON Schema keys as plain JSON Schema.
-        if any(k in value for k in ("properties", "items", "required", "additionalProperties")):
+        if not _SCHEMA_MARKER_KEYS.isdisjoint(value):
             schema_obj = value
         else:
             # Accept text-schema-like wrapper without deep validation.
@@ -318,7 +356,7 @@ def extract_json_schema_descriptor(value: Any, c: Collector, path: str, is_outpu
     else:
         # Unknown wrapper type: still allow but warn.
         c.warn(path, f"unrecognized schema wrapper type '{schema_type}'")
-        if any(k in value for k in ("properties", "items", "required", "additionalProperties")):
+        if not _SCHEMA_MARKER_KEYS.isdisjoint(value):
             schema_obj = value
 
     if schema_obj is not None:
@@ -346,11 +384,6 @@ def validate_task_spec(task_spec: Any, payload: dict[str, Any], c: Collector, pa
         c.error(path, "must contain output_schema")
         return
 
-    extract_json_schema_descriptor(task_spec.get("output_schema"), c, f"{path}.output_schema", is_output_schema=True)
-
-    if "input_schema" in task_spec and task_spec.get("input_schema") is not None:
-        extract_json_schema_descriptor(task_spec.get("input_schema"), c, f"{path}.input_schema", is_output_schema=False)
-
     try:
         ts_size = json_size(task_spec)
     except TypeError as exc:
@@ -359,25 +392,45 @@ def validate_task_spec(task_spec: Any, payload: dict[str, Any], c: Collector, pa
     if ts_size > TASK_SPEC_SIZE_LIMIT:
         c.error(path, f"serialized size {ts_size} exceeds docs guidance limit {TASK_SPEC_SIZE_LIMIT}")
 
+    # Far too large to ship as-is: schema hints only matter once it has been cut down, so skip
+    # the schema walks but still report the combined budget below.
+    if ts_size <= 2 * TASK_SPEC_SIZE_LIMIT:
+        extract_json_schema_descriptor(
+            task_spec.get("output_schema"), c, f"{path}.output_schema", is_output_schema=True
+        )
+        if "input_schema" in task_spec and task_spec.get("input_schema") is not None:
+            extract_json_schema_descriptor(
+                task_spec.get("input_schema"), c, f"{path}.input_schema", is_output_schema=False
+            )
+
     if "input" in payload:
+        remaining = COMBINED_TASK_SPEC_INPUT_LIMIT - ts_size
+        if remaining <= 0:
+            # Any serialized input is at least one byte, so there is no need to measure it.
+            c.error(
+                path,
+                f"serialized task_spec size {ts_size} leaves no room for input within combined docs guidance limit {COMBINED_TASK_SPEC_INPUT_LIMIT}",
+            )
+            return
         try:
-            combined = ts_size + json_size(payload["input"])
+            # Only whether input fits the remaining budget matters, so stop measuring once it doesn't.
+            input_size, truncated = json_size_capped(payload["input"], remaining)
         except TypeError:
-            combined = None
-        if combined is not None and combined > COMBINED_TASK_SPEC_INPUT_LIMIT:
+            return
+        combined = ts_size + input_size
+        if combined > COMBINED_TASK_SPEC_INPUT_LIMIT:
+            size = f"at least {combined}" if truncated else str(combined)
             c.error(
                 path,
-                f"combined serialized size of task_spec + input ({combined}) exceeds docs guidance limit {COMBINED_TASK_SPEC_INPUT_LIMIT}",
+                f"combined serialized size of task_spec + input ({size}) exceeds docs guidance limit {COMBINED_TASK_SPEC_INPUT_LIMIT}",
             )
 
 
-def validate(payload: Any, betas: Set[str]) -> Collector:
-    c = Collector()
-    if not isinstance(payload, dict):
-        c.error("$", "payload must be a JSON object")
-        return c
-
-    processor = payload.get("processor")
+def _check_processor(processor: Any, payload: dict, c: Collector, beta_mask: int) -> None:
+    # Known names are the common case: settle them with one frozenset lookup before the
+    # None/strip() checks. The str guard keeps unhashable values out of the lookup.
+    if type(processor) is str and processor in KNOWN_PROCESSORS:
+        return
     if processor is None:
         c.error("$.processor", "is required")
     elif not isinstance(processor, str) or not processor.strip():
@@ -388,75 +441,115 @@ def validate(payload: Any, betas: Set[str]) -> Collector:
             "processor not in known snapshot set; verify against docs before shipping",
         )
 
-    if "input" not in payload:
-        c.error("$.input", "is required")
-    else:
-        inp = payload["input"]
-        if not isinstance(inp, (str, dict)):
-            c.error("$.input", "must be a string or JSON object")
-
-    if "metadata" in payload:
-        validate_metadata(payload.get("metadata"), c, "$.metadata")
-
-    if "source_policy" in payload and payload.get("source_policy") is not None:
-        validate_source_policy(payload.get("source_policy"), c, "$.source_policy", allow_after_date=False)
-
-    if "previous_interaction_id" in payload:
-        val = payload.get("previous_interaction_id")
-        if val is not None and not isinstance(val, str):
-            c.error("$.previous_interaction_id", "must be a string")
-
-    if "task_spec" in payload:
-        validate_task_spec(payload.get("task_spec"), payload, c, "$.task_spec")
-
-    if "enable_events" in payload:
-        val = payload.get("enable_events")
-        if val is not None and not isinstance(val, bool):
-            c.error("$.enable_events", "must be a boolean")
-        if val and BETA_REQUIREMENTS["enable_events"] not in betas:
-            c.warn(
-                "$.enable_events",
-                f"enable_events is beta-gated; include parallel-beta '{BETA_REQUIREMENTS['enable_events']}'",
-            )
 
-    if "mcp_servers" in payload:
-        validate_mcp_servers(payload.get("mcp_servers"), c, "$.mcp_servers")
-        if payload.get("mcp_servers") and BETA_REQUIREMENTS["mcp_servers"] not in betas:
-            c.warn(
-                "$.mcp_servers",
-                f"mcp_servers is beta-gated; include parallel-beta '{BETA_REQUIREMENTS['mcp_servers']}'",
-            )
+def _check_input(inp: Any, payload: dict, c: Collector, beta_mask: int) -> None:
+    if not isinstance(inp, (str, dict)):
+        c.error("$.input", "must be a string or JSON object")
 
-    if "webhook" in payload:
-        validate_webhook(payload.get("webhook"), c, "$.webhook")
-        if payload.get("webhook") and BETA_REQUIREMENTS["webhook"] not in betas:
-            c.warn(
-                "$.webhook",
-                f"webhook is beta-gated; include parallel-beta '{BETA_REQUIREMENTS['webhook']}'",
-            )
 
-    # Unknown-key hinting (warn only; API may add new fields)
-    known_keys = {
-        "processor",
-        "metadata",
-        "source_policy",
-        "task_spec",
-        "input",
-        "previous_interaction_id",
-        "mcp_servers",
-        "enable_events",
-        "webhook",
-    }
-    for key in payload.keys():
-        if key not in known_keys:
-            c.warn(f"$.{key}", "unknown field for current BetaTaskRunInput snapshot; verify docs/OpenAPI")
+def _check_source_policy(sp: Any, payload: dict, c: Collector, beta_mask: int) -> None:
+    if sp is not None:
+        validate_source_policy(sp, c, "$.source_policy", allow_after_date=False)
+
+
+def _check_previous_interaction_id(val: Any, payload: dict, c: Collector, beta_mask: int) -> None:
+    if val is not None and not isinstance(val, str):
+        c.error("$.previous_interaction_id", "must be a string")
+
+
+def _check_enable_events(val: Any, payload: dict, c: Collector, beta_mask: int) -> None:
+    if val is not None and not isinstance(val, bool):
+        c.error("$.enable_events", "must be a boolean")
+    if val and not beta_mask & _BETA_EVENTS:
+        c.warn(
+            "$.enable_events",
+            f"enable_events is beta-gated; include parallel-beta '{BETA_REQUIREMENTS['enable_events']}'",
+        )
+
+
+def _check_mcp_servers(servers: Any, payload: dict, c: Collector, beta_mask: int) -> None:
+    validate_mcp_servers(servers, c, "$.mcp_servers")
+    if servers and not beta_mask & _BETA_MCP_SERVERS:
+        c.warn(
+            "$.mcp_servers",
+            f"mcp_servers is beta-gated; include parallel-beta '{BETA_REQUIREMENTS['mcp_servers']}'",
+        )
+
 
+def _check_webhook(webhook: Any, payload: dict, c: Collector, beta_mask: int) -> None:
+    validate_webhook(webhook, c, "$.webhook")
+    if webhook and not beta_mask & _BETA_WEBHOOK:
+        c.warn(
+            "$.webhook",
+            f"webhook is beta-gated; include parallel-beta '{BETA_REQUIREMENTS['webhook']}'",
+        )
+
+
+# One handler per known top-level field; anything else gets the unknown-field warning.
+_FIELD_HANDLERS: dict[str, Callable[[Any, dict, Collector, int], None]] = {
+    "processor": _check_processor,
+    "metadata": lambda v, payload, c, beta_mask: validate_metadata(v, c, "$.metadata"),
+    "source_policy": _check_source_policy,
+    "task_spec": lambda v, payload, c, beta_mask: validate_task_spec(v, payload, c, "$.task_spec"),
+    "input": _check_input,
+    "previous_interaction_id": _check_previous_interaction_id,
+    "mcp_servers": _check_mcp_servers,
+    "enable_events": _check_enable_events,
+    "webhook": _check_webhook,
+}
+
+
+def validate(payload: Any, betas: Set[str], fail_fast: bool = False) -> Collector:
+    """Validate a Task run create payload; with ``fail_fast`` stop at the first error."""
+    c = Collector(fail_fast)
+    try:
+        _validate_payload(payload, betas, c)
+    except StopValidation:
+        pass
     return c
 
 
-def main() -> int:
-    parser = argparse.ArgumentParser(description="Validate a Parallel Task run create payload")
-    parser.add_argument("json_file", nargs="?", default="-", help="JSON file path or '-' for stdin")
+def _validate_payload(payload: Any, betas: Set[str], c: Collector) -> None:
+    if not isinstance(payload, dict):
+        c.error("$", "payload must be a JSON object")
+        return
+
+    beta_mask = 0
+    for beta in betas:
+        beta_mask |= _BETA_BITS.get(beta, 0)
+
+    # Single pass over the payload; unknown keys are hinted (warn only; API may add new fields).
+    for key, value in payload.items():
+        handler = _FIELD_HANDLERS.get(key)
+        if handler is not None:
+            handler(value, payload, c, beta_mask)
+        else:
+            c.warn(f"$.{key}", "unknown field for current BetaTaskRunInput snapshot; verify docs/OpenAPI")
+
+    if "processor" not in payload:
+        c.error("$.processor", "is required")
+    if "input" not in payload:
+        c.error("$.input", "is required")
+
+
+def validate_file(path: str, betas: Set[str], fail_fast: bool = False) -> tuple[str, list[str], list[str], str | None]:
+    """Load and validate one payload file; returns ``(path, errors, warnings, read_error)``."""
+    try:
+        payload = load_json(path)
+    except Exception as exc:  # noqa: BLE001
+        return path, [], [], f"failed to read JSON: {exc}"
+    c = validate(payload, betas, fail_fast)
+    return path, c.errors, c.warnings, None
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Validate Parallel Task run create payload(s)")
+    parser.add_argument(
+        "json_file",
+        nargs="*",
+        default=["-"],
+        help="JSON file path(s), or '-' for stdin (default). Multiple files are validated in one run",
+    )
     parser.add_argument(
         "--beta",
         action="append",
@@ -464,7 +557,18 @@ def main() -> int:
         help="parallel-beta value(s) used with the request (repeatable or comma-separated)",
     )
     parser.add_argument("--strict", action="store_true", help="Treat warnings as failures")
-    args = parser.parse_args()
+    parser.add_argument("--fail-fast", action="store_true", help="Stop validating a payload at its first error")
+    return parser
+
+
+_PARSER = _build_parser()
+
+
+def main() -> int:
+    args = _PARSER.parse_args()
+
+    if len(args.json_file) > 1 and "-" in args.json_file:
+        _PARSER.error("'-' (stdin) cannot be combined with other files")
 
     betas: Set[str] = set()
     for item in args.beta:
@@ -473,29 +577,23 @@ def main() -> int:
             if part:
                 betas.add(part)
 
+    header = ["Parallel Task payload validation"]
+    if betas:
+        header.append("betas=" + ",".join(sorted(betas)))
+    if len(args.json_file) > 1:
+        return validate_many(args.json_file, validate_file, (betas, args.fail_fast), header, args.strict)
+
     try:
-        payload = load_json(args.json_file)
+        payload = load_json(args.json_file[0])
     except Exception as exc:  # noqa: BLE001
         print(f"ERROR: failed to read JSON: {exc}", file=sys.stderr)
         return 2
 
-    c = validate(payload, betas)
+    c = validate(payload, betas, args.fail_fast)
 
-    print("Parallel Task payload validation")
-    if betas:
-        print("betas=" + ",".join(sorted(betas)))
-    print(f"errors={len(c.errors)} warnings={len(c.warnings)}")
-    for msg in c.errors:
-        print(f"ERROR  {msg}")
-    for msg in c.warnings:
-        print(f"WARN   {msg}")
-
-    if c.errors:
-        return 1
-    if args.strict and c.warnings:
-        return 1
-    print("OK")
-    return 0
+    for line in header:
+        print(line)
+    return print_report(c.errors, c.warnings, args.strict)
 
 
 if __name__ == "__main__":
@@ -9,22 +9,39 @@ then HMAC-SHA256 with the webhook signing secret.
 from __future__ import annotations
 
 import argparse
-import hashlib
-import hmac
-import json
+import functools
+import os
+import re
 import sys
 import time
-from pathlib import Path
-from typing import Iterable, List
+from typing import TYPE_CHECKING, BinaryIO, Iterable, List
+
+if TYPE_CHECKING:
+    import hmac
 
 
 DEFAULT_TOLERANCE_SECONDS = 300
+_READ_CHUNK_SIZE = 1 << 20
+_JSON_BOOL = {True: "true", False: "false"}
+_HEX_RE = re.compile(r"[0-9a-fA-F]{32,}")
+
 
+def _read_into_buffer(stream: BinaryIO, size_hint: int = 0) -> memoryview:
+    # Fill one bytearray in place (readinto for the known size, then 1 MiB reads for anything
+    # beyond it, e.g. pipes reporting size 0) and hand out a view, so the body is never copied.
+    buf = bytearray(size_hint)
+    n = (stream.readinto(buf) or 0) if size_hint else 0
+    del buf[n:]
+    while chunk := stream.read(_READ_CHUNK_SIZE):
+        buf += chunk
+    return memoryview(buf)
 
-def load_body(body_file: str | None) -> bytes:
+
+def load_body(body_file: str | None) -> memoryview:
     if not body_file or body_file == "-":
-        return sys.stdin.buffer.read()
-    return Path(body_file).read_bytes()
+        return _read_into_buffer(sys.stdin.buffer)
+    with open(body_file, "rb") as fh:
+        return _read_into_buffer(fh, os.fstat(fh.fileno()).st_size)
 
 
 def parse_signature_values(header_value: str) -> List[str]:
@@ -36,6 +53,10 @@ def parse_signature_values(header_value: str) -> List[str]:
     - "<hex>"
     - comma-joined combinations of the above
     """
+    # Fast path for the single-signature header Parallel actually sends: "v1,<hex>".
+    if header_value.startswith("v1,") and _HEX_RE.fullmatch(header_value, 3):
+        return [header_value[3:].lower()]
+
     candidates: List[str] = []
     tokens = [t.strip() for t in header_value.split(",") if t.strip()]
     if not tokens:
@@ -63,43 +84,129 @@ def parse_signature_values(header_value: str) -> List[str]:
 
 
 def dedupe(values: Iterable[str]) -> List[str]:
-    seen = set()
-    out = []
+    # Headers carry one or two signatures; a linear scan beats hashing each 64-char digest.
+    out: List[str] = []
     for v in values:
-        if v not in seen:
-            seen.add(v)
+        if v not in out:
             out.append(v)
     return out
 
 
 def is_probably_hex(value: str) -> bool:
-    if len(value) < 32:
-        return False
-    try:
-        int(value, 16)
-    except ValueError:
-        return False
-    return True
+    return _HEX_RE.fullmatch(value) is not None
 
 
-def compute_expected_hex(secret: str, webhook_id: str, timestamp: str, body: bytes) -> str:
-    prefix = f"{webhook_id}.{timestamp}.".encode("utf-8")
-    signed_payload = prefix + body
-    return hmac.new(secret.encode("utf-8"), signed_payload, hashlib.sha256).hexdigest()
+@functools.lru_cache(maxsize=8)
+def primed_hmac(secret: str) -> hmac.HMAC:
+    """HMAC-SHA256 keyed with ``secret`` and nothing hashed yet; ``.copy()`` it per message.
+
+    Keying already hashes the ipad/opad key blocks into the inner/outer contexts, so the
+    cached object is the precomputed key schedule. It is shared between callers and must
+    never be updated directly.
+    """
+    # hashlib/hmac load OpenSSL; imported here so --help and argument errors skip that cost.
+    import hashlib
+    import hmac
+
+    return hmac.new(secret.encode("utf-8"), None, hashlib.sha256)
+
+
+def compute_expected_digest(base: hmac.HMAC, webhook_id: str, timestamp: str, body: bytes | memoryview) -> bytes:
+    # Copying the primed object reuses its inner/outer key-pad state instead of re-deriving it.
+    mac = base.copy()
+    # Feed the signed "<id>.<timestamp>." prefix and the body separately; same digest as
+    # hashing their concatenation, without copying the whole body into a new bytes object.
+    mac.update(f"{webhook_id}.{timestamp}.".encode("utf-8"))
+    mac.update(body)
+    return mac.digest()
+
+
+def signature_matches(expected: bytes, candidates: Iterable[str]) -> bool:
+    import hmac
+
+    matched = False
+    for cand in candidates:
+        try:
+            cand_digest = bytes.fromhex(cand)
+        except ValueError:  # odd-length hex can never match a digest
+            continue
+        # No early exit: every candidate is compared, so timing does not reveal which one matched.
+        matched |= hmac.compare_digest(expected, cand_digest)
+    return matched
+
+
+def verify_batch(
+    lines: Iterable[bytes],
+    base: hmac.HMAC,
+    *,
+    now: int,
+    tolerance_seconds: int,
+    print_json: bool,
+) -> int:
+    """Verify NDJSON jobs ``{"id", "ts", "sig", "body_b64"}`` with one primed HMAC, one result line each."""
+    # Only batch mode parses JSON/base64, so these stay off the single-webhook startup path.
+    import base64
+    import json
+
+    total = 0
+    valid_count = 0
+    for lineno, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        total += 1
+        try:
+            job = json.loads(line)
+            webhook_id = str(job["id"])
+            timestamp = str(job["ts"])
+            ts = int(timestamp)
+            candidates = parse_signature_values(job["sig"])
+            if not candidates:
+                raise ValueError("could not parse any candidate hex signatures from sig")
+            body = base64.b64decode(job["body_b64"], validate=True)
+        except (AttributeError, KeyError, TypeError, ValueError) as exc:
+            error = f"line {lineno}: malformed job ({type(exc).__name__}: {exc})"
+            if print_json:
+                print(json.dumps({"line": lineno, "valid": False, "error": error}))
+            else:
+                print(f"INVALID {error}")
+            continue
+
+        age = abs(now - ts)
+        within_tolerance = age <= tolerance_seconds
+        matched = signature_matches(compute_expected_digest(base, webhook_id, timestamp, body), candidates)
+        valid = matched and within_tolerance
+        valid_count += valid
+        if print_json:
+            result = {
+                "id": webhook_id,
+                "valid": valid,
+                "matched_signature": matched,
+                "within_tolerance": within_tolerance,
+                "age_seconds": age,
+            }
+            print(json.dumps(result))
+        else:
+            print(
+                f"{'VALID' if valid else 'INVALID'} id={webhook_id} matched_signature={matched} "
+                f"within_tolerance={within_tolerance} age_seconds={age}"
+            )
+
+    if not print_json:
+        print(f"batch={total} valid={valid_count} invalid={total - valid_count}")
+    # An empty batch verified nothing, so it must not pass as "all valid".
+    return 0 if total and valid_count == total else 1
 
 
 def main() -> int:
     parser = argparse.ArgumentParser(description="Verify Parallel webhook HMAC signature")
     parser.add_argument("--secret", required=True, help="Parallel webhook signing secret")
-    parser.add_argument("--webhook-id", required=True, help="Header: parallel-webhook-id")
+    parser.add_argument("--webhook-id", help="Header: parallel-webhook-id")
     parser.add_argument(
         "--timestamp",
-        required=True,
         help="Header: parallel-webhook-timestamp (unix epoch seconds, per docs)",
     )
     parser.add_argument(
         "--signature-header",
-        required=True,
         help="Header: parallel-webhook-signature",
     )
     parser.add_argument(
@@ -119,14 +226,34 @@ def main() -> int:
         help="Override current unix epoch seconds (for tests)",
     )
     parser.add_argument("--print-json", action="store_true", help="Print machine-readable result")
+    parser.add_argument(
+        "--batch-jsonl",
+        help="Verify many webhooks with one secret: NDJSON file (or '-' for stdin) of "
+        '{"id", "ts", "sig", "body_b64"} objects; replaces the per-webhook header options',
+    )
     args = parser.parse_args()
 
+    if args.batch_jsonl:
+        if args.webhook_id is not None or args.timestamp is not None or args.signature_header is not None:
+            parser.error("--webhook-id, --timestamp and --signature-header cannot be combined with --batch-jsonl")
+        now = args.now if args.now is not None else int(time.time())
+        base = primed_hmac(args.secret)
+        options = {"now": now, "tolerance_seconds": args.tolerance_seconds, "print_json": args.print_json}
+        if args.batch_jsonl == "-":
+            return verify_batch(sys.stdin.buffer, base, **options)
+        with open(args.batch_jsonl, "rb") as fh:
+            return verify_batch(fh, base, **options)
+
+    if args.webhook_id is None or args.timestamp is None or args.signature_header is None:
+        parser.error("--webhook-id, --timestamp and --signature-header are required unless --batch-jsonl is used")
+
     body = load_body(args.body_file)
     candidates = parse_signature_values(args.signature_header)
     if not candidates:
         msg = "Could not parse any candidate hex signatures from --signature-header"
         if args.print_json:
-            print(json.dumps({"valid": False, "error": msg}))
+            # msg is a fixed ASCII message, so it needs no JSON escaping.
+            print(f'{{"valid": false, "error": "{msg}"}}')
         else:
             print(f"INVALID: {msg}")
         return 1
@@ -136,7 +263,7 @@ def main() -> int:
     except ValueError:
         msg = "timestamp must be a unix epoch integer"
         if args.print_json:
-            print(json.dumps({"valid": False, "error": msg}))
+            print(f'{{"valid": false, "error": "{msg}"}}')
         else:
             print(f"INVALID: {msg}")
         return 1
@@ -145,21 +272,18 @@ def main() -> int:
     age = abs(now - ts)
     within_tolerance = age <= args.tolerance_seconds
 
-    expected_hex = compute_expected_hex(args.secret, args.webhook_id, args.timestamp, body)
-    matched = any(hmac.compare_digest(expected_hex, cand) for cand in candidates)
+    expected = compute_expected_digest(primed_hmac(args.secret), args.webhook_id, args.timestamp, body)
+    matched = signature_matches(expected, candidates)
+    expected_hex = expected.hex()
     valid = matched and within_tolerance
 
-    result = {
-        "valid": valid,
-        "matched_signature": matched,
-        "within_tolerance": within_tolerance,
-        "age_seconds": age,
-        "candidate_count": len(candidates),
-        "expected_hex": expected_hex,
-    }
-
     if args.print_json:
-        print(json.dumps(result))
+        # Fixed shape (bools, ints, a hex string), so format it directly, matching json.dumps output.
+        print(
+            f'{{"valid": {_JSON_BOOL[valid]}, "matched_signature": {_JSON_BOOL[matched]}, '
+            f'"within_tolerance": {_JSON_BOOL[within_tolerance]}, "age_seconds": {age}, '
+            f'"candidate_count": {len(candidates)}, "expected_hex": "{expected_hex}"}}'
+        )
     else:
         print("VALID" if valid else "INVALID")
         print(f"matched_signature={matched}")
@@ -1,26 +1,90 @@
 from __future__ import annotations
 
+import base64
+import contextlib
 import hashlib
 import hmac
+import http.client
+import importlib.util
+import io
 import json
 import subprocess
 import sys
 import tempfile
+import threading
 import time
 import unittest
+import weakref
 from pathlib import Path
+from types import ModuleType
+from typing import Any, Iterator
+from unittest import mock
 
 
 ROOT = Path(__file__).resolve().parents[1]
 SCRIPTS = ROOT / "scripts"
 FIXTURES = ROOT / "tests" / "fixtures"
 
+# Scripts import their shared helpers from the script directory, as they do when run directly.
+if str(SCRIPTS) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS))
 
-def run_py(script_name: str, *args: str, stdin: str | None = None) -> subprocess.CompletedProcess[str]:
-    cmd = [sys.executable, str(SCRIPTS / script_name), *args]
+import _shared_validators as shared_validators  # noqa: E402
+
+_MODULES: dict[str, ModuleType] = {}
+
+
+def load_script(script_name: str) -> ModuleType:
+    """Import a script once as a module named after its stem."""
+    module = _MODULES.get(script_name)
+    if module is None:
+        path = SCRIPTS / script_name
+        spec = importlib.util.spec_from_file_location(path.stem, path)
+        assert spec is not None and spec.loader is not None
+        module = importlib.util.module_from_spec(spec)
+        # Registered so multiprocessing workers can pickle the script's functions by name.
+        sys.modules[path.stem] = module
+        with mock.patch.object(sys, "argv", [str(path)]):
+            spec.loader.exec_module(module)
+        _MODULES[script_name] = module
+    return module
+
+
+def run_main(script_name: str, *args: str, stdin: str | bytes | None = None) -> subprocess.CompletedProcess[str]:
+    """Call a script's main() in-process with patched argv and stdio."""
+    module = load_script(script_name)
+    data = stdin.encode("utf-8") if isinstance(stdin, str) else stdin or b""
+    # Byte-backed text streams so scripts that use sys.stdin.buffer / sys.stdout.buffer still work.
+    fake_stdin = io.TextIOWrapper(io.BytesIO(data), encoding="utf-8")
+    out = io.BytesIO()
+    fake_stdout = io.TextIOWrapper(out, encoding="utf-8", write_through=True)
+    err = io.StringIO()
+    argv = [str(SCRIPTS / script_name), *args]
+    with (
+        mock.patch.object(sys, "argv", argv),
+        mock.patch.object(sys, "stdin", fake_stdin),
+        mock.patch.object(sys, "stdout", fake_stdout),
+        contextlib.redirect_stderr(err),
+    ):
+        try:
+            returncode = module.main()
+        except SystemExit as exc:
+            if exc.code is None or isinstance(exc.code, int):
+                returncode = exc.code or 0
+            else:
+                print(exc.code, file=sys.stderr)
+                returncode = 1
+    fake_stdout.flush()
+    return subprocess.CompletedProcess(argv, returncode, out.getvalue().decode("utf-8"), err.getvalue())
+
+
+def run_py(script_name: str, *args: str) -> subprocess.CompletedProcess[str]:
+    """Run a script in a fresh interpreter, for checks that need real process start-up."""
+    # -S/-s/-E skip site-packages, user site and PYTHON* env lookups, -B skips .pyc writes.
+    # Not -I: it also drops the script directory from sys.path, which the validators import from.
+    cmd = [sys.executable, "-B", "-S", "-s", "-E", str(SCRIPTS / script_name), *args]
     return subprocess.run(
         cmd,
-        input=stdin,
         text=True,
         capture_output=True,
         cwd=ROOT,
@@ -79,16 +143,42 @@ class SearchValidatorTests(unittest.TestCase):
             "source_policy": {"include_domains": ["sec.gov"], "after_date": "2025-01-01"},
             "excerpts": {"max_chars_per_result": 1500, "max_chars_total": 5000},
         }
-        proc = run_py("validate_search_payload.py", "-", stdin=json.dumps(payload))
+        proc = run_main("validate_search_payload.py", "-", stdin=json.dumps(payload))
         self.assertEqual(proc.returncode, 0, proc.stdout + proc.stderr)
         self.assertIn("OK", proc.stdout)
 
+    def test_validate_search_payload_accepts_domain_selector_forms(self) -> None:
+        selectors = ["bücher.de", "example.com.", ".gov", "_dmarc.example.com", "*.example.com", "*.gov"]
+        payload = {"objective": "x", "source_policy": {"include_domains": selectors}}
+        proc = run_main("validate_search_payload.py", "-", stdin=json.dumps(payload))
+        self.assertEqual(proc.returncode, 0, proc.stdout + proc.stderr)
+        self.assertIn("OK", proc.stdout)
+
+    def test_validate_search_payload_keeps_big_integers_exact_with_or_without_orjson(self) -> None:
+        # orjson alone would read this as a float and report "must be an integer".
+        payload = '{"objective": "x", "max_results": 123456789012345678901234567890}'
+        for orjson in (shared_validators.orjson, None):
+            with self.subTest(orjson=orjson is not None), mock.patch.object(shared_validators, "orjson", orjson):
+                proc = run_main("validate_search_payload.py", "-", stdin=payload)
+                self.assertEqual(proc.returncode, 0, proc.stdout + proc.stderr)
+                self.assertIn("errors=0 warnings=1", proc.stdout)
+                self.assertIn("exceeds current docs guidance max", proc.stdout)
+
+    def test_validate_search_payload_fail_fast_stops_at_first_error(self) -> None:
+        payload = {"objective": 1, "mode": "slow", "max_results": 0}
+        proc = run_main("validate_search_payload.py", "--fail-fast", "-", stdin=json.dumps(payload))
+        self.assertEqual(proc.returncode, 1)
+        self.assertIn("errors=1 ", proc.stdout)
+        self.assertIn("$.objective", proc.stdout)
+        self.assertNotIn("$.mode", proc.stdout)
+        self.assertNotIn("$.max_results", proc.stdout)
+
     def test_validate_search_payload_invalid_domain(self) -> None:
         payload = {
             "search_queries": [],
             "source_policy": {"include_domains": ["https://bad.example/path"]},
         }
-        proc = run_py("validate_search_payload.py", "-", stdin=json.dumps(payload))
+        proc = run_main("validate_search_payload.py", "-", stdin=json.dumps(payload))
         self.assertEqual(proc.returncode, 1)
         self.assertIn("ERROR", proc.stdout)
         self.assertIn("include_domains[0]", proc.stdout)
@@ -96,7 +186,7 @@ class SearchValidatorTests(unittest.TestCase):
 
 class ExtractValidatorTests(unittest.TestCase):
     def test_validate_extract_payload_valid_from_fixture(self) -> None:
-        proc = run_py(
+        proc = run_main(
             "validate_extract_payload.py",
             "--beta",
             "search-extract-2025-10-10",
@@ -112,7 +202,7 @@ class ExtractValidatorTests(unittest.TestCase):
             "excerpts": {"max_chars_per_result": 1500, "max_chars_total": 3000},
             "full_content": {"max_chars_per_result": 8000},
         }
-        proc = run_py(
+        proc = run_main(
             "validate_extract_payload.py",
             "--beta",
             "search-extract-2025-10-10",
@@ -124,18 +214,40 @@ class ExtractValidatorTests(unittest.TestCase):
 
     def test_validate_extract_payload_invalid_url(self) -> None:
         payload = {"urls": ["example.com"], "excerpts": False, "full_content": False}
-        proc = run_py("validate_extract_payload.py", "-", stdin=json.dumps(payload))
+        proc = run_main("validate_extract_payload.py", "-", stdin=json.dumps(payload))
         self.assertEqual(proc.returncode, 1)
         self.assertIn("ERROR", proc.stdout)
         self.assertIn("$.urls[0]", proc.stdout)
 
+    def test_validate_extract_payload_fail_fast_stops_at_first_error(self) -> None:
+        payload = {"urls": [1, "example.com"], "objective": 3}
+        proc = run_main("validate_extract_payload.py", "--fail-fast", "-", stdin=json.dumps(payload))
+        self.assertEqual(proc.returncode, 1)
+        self.assertIn("errors=1 ", proc.stdout)
+        self.assertIn("$.urls[0]", proc.stdout)
+        self.assertNotIn("$.urls[1]", proc.stdout)
+
     def test_validate_extract_payload_warns_no_content_and_missing_beta(self) -> None:
-        proc = run_py("validate_extract_payload.py", str(FIXTURES / "extract-no-content.json"))
+        proc = run_main("validate_extract_payload.py", str(FIXTURES / "extract-no-content.json"))
         self.assertEqual(proc.returncode, 0, proc.stdout + proc.stderr)
         self.assertIn("WARN", proc.stdout)
         self.assertIn("both excerpts and full_content are disabled", proc.stdout)
         self.assertIn("search-extract-2025-10-10", proc.stdout)
 
+    def test_validate_extract_payload_multiple_files(self) -> None:
+        proc = run_main(
+            "validate_extract_payload.py",
+            "--beta",
+            "search-extract-2025-10-10",
+            str(FIXTURES / "extract-valid.json"),
+            str(FIXTURES / "extract-no-content.json"),
+            str(FIXTURES / "missing.json"),
+        )
+        self.assertEqual(proc.returncode, 2, proc.stdout + proc.stderr)
+        self.assertIn(f"file={FIXTURES / 'extract-valid.json'}", proc.stdout)
+        self.assertIn("failed to read JSON", proc.stdout)
+        self.assertIn("files=3 failed=1", proc.stdout)
+
 
 class TaskValidatorTests(unittest.TestCase):
     def test_validate_task_payload_valid(self) -> None:
@@ -155,7 +267,7 @@ class TaskValidatorTests(unittest.TestCase):
                 }
             },
         }
-        proc = run_py(
+        proc = run_main(
             "validate_task_payload.py",
             "--beta",
             "events-sse-2025-07-24",
@@ -167,11 +279,102 @@ class TaskValidatorTests(unittest.TestCase):
 
     def test_validate_task_payload_warns_without_beta(self) -> None:
         payload = {"processor": "base", "input": "hello", "webhook": {"url": "https://example.com/webhook"}}
-        proc = run_py("validate_task_payload.py", "-", stdin=json.dumps(payload))
+        proc = run_main("validate_task_payload.py", "-", stdin=json.dumps(payload))
         self.assertEqual(proc.returncode, 0, proc.stdout + proc.stderr)
         self.assertIn("WARN", proc.stdout)
         self.assertIn("webhook is beta-gated", proc.stdout)
 
+    def test_validate_task_payload_single_file_report_shape(self) -> None:
+        # Same shape as the other validators: counts first, then errors, then warnings.
+        payload = {"unknown_field": 1, "processor": 5, "input": "hello"}
+        proc = run_main("validate_task_payload.py", "-", stdin=json.dumps(payload))
+        self.assertEqual(proc.returncode, 1, proc.stdout + proc.stderr)
+        lines = proc.stdout.splitlines()
+        self.assertEqual(lines[:2], ["Parallel Task payload validation", "errors=1 warnings=1"])
+        self.assertTrue(lines[2].startswith("ERROR  $.processor:"), proc.stdout)
+        self.assertTrue(lines[3].startswith("WARN   $.unknown_field:"), proc.stdout)
+
+    def test_validate_task_payload_oversized_spec_still_checks_combined_size(self) -> None:
+        # Over twice the task_spec limit: schema hints are skipped, the combined budget is not.
+        payload = {
+            "processor": "base",
+            "input": "hello",
+            "task_spec": {"output_schema": {"type": "text", "description": "x" * 31000}},
+        }
+        proc = run_main("validate_task_payload.py", "-", stdin=json.dumps(payload))
+        self.assertEqual(proc.returncode, 1, proc.stdout + proc.stderr)
+        self.assertIn("errors=2 ", proc.stdout)
+        self.assertIn("exceeds docs guidance limit 15000", proc.stdout)
+        self.assertIn("leaves no room for input within combined docs guidance limit 18000", proc.stdout)
+
+    def test_validate_task_payload_combined_size_is_exact_unless_measurement_stopped(self) -> None:
+        spec = {"output_schema": "s"}  # 21 chars serialized
+        cases = (
+            # A string input is encoded in one piece, so its full size is known: 21 + 17992.
+            ("x" * 17990, "(18013) exceeds"),
+            # Measuring a long array stops once it is over budget, so only a lower bound is known.
+            (["xxxxxxxxxx"] * 2000, "(at least "),
+        )
+        for task_input, expected in cases:
+            with self.subTest(input_type=type(task_input).__name__):
+                payload = {"processor": "base", "input": task_input, "task_spec": spec}
+                proc = run_main("validate_task_payload.py", "-", stdin=json.dumps(payload))
+                self.assertEqual(proc.returncode, 1, proc.stdout + proc.stderr)
+                self.assertIn(f"combined serialized size of task_spec + input {expected}", proc.stdout)
+
+    def test_validate_task_payload_sizes_non_ascii_as_escaped_json(self) -> None:
+        # 2600 "é" serialize as 15600 \u00e9 escapes: over the 15000 limit, though only 5200 UTF-8 bytes.
+        oversized = {"processor": "base", "input": "x", "task_spec": {"output_schema": "é" * 2600}}
+        # A lone surrogate is valid JSON text for stdlib json, so it must not crash size checks.
+        surrogate = '{"processor": "base", "input": "x", "task_spec": {"output_schema": "\\ud800"}}'
+        for orjson in (shared_validators.orjson, None):
+            with self.subTest(orjson=orjson is not None), mock.patch.object(shared_validators, "orjson", orjson):
+                proc = run_main("validate_task_payload.py", "-", stdin=json.dumps(oversized))
+                self.assertEqual(proc.returncode, 1, proc.stdout + proc.stderr)
+                self.assertIn("serialized size 15620 exceeds docs guidance limit 15000", proc.stdout)
+
+                proc = run_main("validate_task_payload.py", "-", stdin=surrogate)
+                self.assertEqual(proc.returncode, 0, proc.stdout + proc.stderr)
+                self.assertIn("OK", proc.stdout)
+
+    def test_validate_task_payload_same_result_with_or_without_orjson(self) -> None:
+        # Compact stdlib JSON writes 1e100 as "1e+100": 14970 x's make the spec exactly 15001 chars.
+        # orjson would write "1e100" (15000, under the limit), so the count must not use it.
+        payload = {
+            "processor": "base",
+            "input": {"big": 123456789012345678901234567890},
+            "task_spec": {"output_schema": "x" * 14970, "n": 1e100},
+        }
+        outputs = []
+        for orjson in (shared_validators.orjson, None):
+            with self.subTest(orjson=orjson is not None), mock.patch.object(shared_validators, "orjson", orjson):
+                proc = run_main("validate_task_payload.py", "-", stdin=json.dumps(payload))
+                self.assertEqual(proc.returncode, 1, proc.stdout + proc.stderr)
+                self.assertIn("serialized size 15001 exceeds docs guidance limit 15000", proc.stdout)
+                outputs.append(proc.stdout)
+        self.assertEqual(outputs[0], outputs[-1])
+
+    def test_validate_task_payload_fail_fast_stops_at_first_error(self) -> None:
+        payload = {"input": 3, "metadata": 5}
+        proc = run_main("validate_task_payload.py", "--fail-fast", "-", stdin=json.dumps(payload))
+        self.assertEqual(proc.returncode, 1, proc.stdout + proc.stderr)
+        self.assertIn("errors=1 ", proc.stdout)
+        self.assertIn("$.input: must be a string or JSON object", proc.stdout)
+
+    def test_validate_task_payload_many_files_in_parallel(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            paths = []
+            for i in range(8):
+                path = Path(td) / f"task-{i}.json"
+                payload = {"processor": "base", "input": f"q{i}"} if i else {"input": "no processor"}
+                path.write_text(json.dumps(payload))
+                paths.append(str(path))
+            proc = run_main("validate_task_payload.py", *paths)
+        self.assertEqual(proc.returncode, 1, proc.stdout + proc.stderr)
+        self.assertLess(proc.stdout.index("task-0.json"), proc.stdout.index("task-7.json"))
+        self.assertIn("$.processor: is required", proc.stdout)
+        self.assertIn("files=8 failed=1", proc.stdout)
+
 
 class WebhookVerifierTests(unittest.TestCase):
     def _signed_case(self) -> tuple[str, str, str, bytes, str]:
@@ -185,28 +388,53 @@ class WebhookVerifierTests(unittest.TestCase):
 
     def test_verify_webhook_signature_valid(self) -> None:
         secret, webhook_id, timestamp, body, sig = self._signed_case()
-        with tempfile.TemporaryDirectory() as td:
-            body_path = Path(td) / "body.json"
-            body_path.write_bytes(body)
-            proc = run_py(
-                "verify_webhook_signature.py",
-                "--secret",
-                secret,
-                "--webhook-id",
-                webhook_id,
-                "--timestamp",
-                timestamp,
-                "--signature-header",
-                f"v1,{sig}",
-                "--body-file",
-                str(body_path),
-                "--print-json",
-            )
+        proc = run_main(
+            "verify_webhook_signature.py",
+            "--secret",
+            secret,
+            "--webhook-id",
+            webhook_id,
+            "--timestamp",
+            timestamp,
+            "--signature-header",
+            f"v1,{sig}",
+            "--body-file",
+            "-",
+            "--print-json",
+            stdin=body,
+        )
         self.assertEqual(proc.returncode, 0, proc.stdout + proc.stderr)
         parsed = json.loads(proc.stdout)
         self.assertTrue(parsed["valid"])
         self.assertTrue(parsed["matched_signature"])
 
+    def test_verify_webhook_signature_body_file_path(self) -> None:
+        secret, webhook_id, timestamp, body, _ = self._signed_case()
+        for label, content in (("payload", body), ("empty", b"")):
+            signed = f"{webhook_id}.{timestamp}.".encode("utf-8") + content
+            sig = hmac.new(secret.encode("utf-8"), signed, hashlib.sha256).hexdigest()
+            with self.subTest(body=label), tempfile.TemporaryDirectory() as td:
+                body_path = Path(td) / "body.bin"
+                body_path.write_bytes(content)
+                proc = run_main(
+                    "verify_webhook_signature.py",
+                    "--secret",
+                    secret,
+                    "--webhook-id",
+                    webhook_id,
+                    "--timestamp",
+                    timestamp,
+                    "--signature-header",
+                    f"v1,{sig}",
+                    "--body-file",
+                    str(body_path),
+                    "--print-json",
+                )
+                self.assertEqual(proc.returncode, 0, proc.stdout + proc.stderr)
+                parsed = json.loads(proc.stdout)
+                self.assertTrue(parsed["valid"])
+                self.assertTrue(parsed["matched_signature"])
+
     def test_verify_webhook_signature_replay_window_failure(self) -> None:
         secret = "sekret"
         webhook_id = "wh_123"
@@ -214,36 +442,285 @@ class WebhookVerifierTests(unittest.TestCase):
         body = b"{}"
         signed = f"{webhook_id}.{timestamp}.".encode("utf-8") + body
         sig = hmac.new(secret.encode("utf-8"), signed, hashlib.sha256).hexdigest()
-        with tempfile.TemporaryDirectory() as td:
-            body_path = Path(td) / "body.json"
-            body_path.write_bytes(body)
-            proc = run_py(
-                "verify_webhook_signature.py",
-                "--secret",
-                secret,
-                "--webhook-id",
-                webhook_id,
-                "--timestamp",
-                timestamp,
-                "--signature-header",
-                f"v1,{sig}",
-                "--body-file",
-                str(body_path),
-                "--now",
-                str(int(timestamp) + 10_000),
-                "--print-json",
-            )
+        proc = run_main(
+            "verify_webhook_signature.py",
+            "--secret",
+            secret,
+            "--webhook-id",
+            webhook_id,
+            "--timestamp",
+            timestamp,
+            "--signature-header",
+            f"v1,{sig}",
+            "--body-file",
+            "-",
+            "--now",
+            str(int(timestamp) + 10_000),
+            "--print-json",
+            stdin=body,
+        )
         self.assertEqual(proc.returncode, 1, proc.stdout + proc.stderr)
         parsed = json.loads(proc.stdout)
         self.assertFalse(parsed["valid"])
         self.assertFalse(parsed["within_tolerance"])
 
+    def test_verify_webhook_signature_batch_jsonl(self) -> None:
+        secret, webhook_id, timestamp, body, sig = self._signed_case()
+        jobs = [
+            {"id": webhook_id, "ts": timestamp, "sig": f"v1,{sig}", "body_b64": base64.b64encode(body).decode()},
+            {"id": "wh_bad", "ts": timestamp, "sig": f"v1,{'0' * 64}", "body_b64": base64.b64encode(body).decode()},
+            {"id": "wh_broken"},
+            {"id": "wh_nosig", "ts": timestamp, "sig": "v1,not-hex", "body_b64": base64.b64encode(body).decode()},
+        ]
+        stdin = "\n".join(json.dumps(job) for job in jobs) + "\n"
+        batch_args = ("verify_webhook_signature.py", "--secret", secret, "--batch-jsonl", "-", "--now", timestamp)
+        proc = run_main(*batch_args, stdin=stdin)
+        self.assertEqual(proc.returncode, 1, proc.stdout + proc.stderr)
+        lines = proc.stdout.splitlines()
+        self.assertTrue(lines[0].startswith(f"VALID id={webhook_id} matched_signature=True"), proc.stdout)
+        self.assertTrue(lines[1].startswith("INVALID id=wh_bad matched_signature=False"), proc.stdout)
+        self.assertIn("line 3: malformed job", lines[2])
+        self.assertIn("line 4: malformed job", lines[3])
+        self.assertEqual(lines[4], "batch=4 valid=1 invalid=3")
+
+        proc = run_main(*batch_args, "--print-json", stdin=stdin)
+        self.assertEqual(proc.returncode, 1, proc.stdout + proc.stderr)
+        results = [json.loads(line) for line in proc.stdout.splitlines()]
+        self.assertEqual(len(results), 4)
+        self.assertEqual(results[0]["id"], webhook_id)
+        self.assertTrue(results[0]["valid"])
+        self.assertFalse(results[1]["matched_signature"])
+        self.assertEqual([r["line"] for r in results[2:]], [3, 4])
+        self.assertFalse(any(r["valid"] for r in results[2:]))
+
+        proc = run_main(*batch_args, stdin="\n  \n")
+        self.assertEqual(proc.returncode, 1, proc.stdout + proc.stderr)
+        self.assertIn("batch=0 valid=0 invalid=0", proc.stdout)
+
+        proc = run_main(*batch_args, "--webhook-id", webhook_id, stdin=stdin)
+        self.assertEqual(proc.returncode, 2, proc.stdout + proc.stderr)
+        self.assertIn("cannot be combined with --batch-jsonl", proc.stderr)
+
+
+class _FakeSimdjsonDoc(dict):
+    pass
+
+
+class _FakeSimdjsonParser:
+    """Mimics pysimdjson: re-parsing while a document from this parser is alive raises."""
+
+    def __init__(self) -> None:
+        self._live: weakref.ref[_FakeSimdjsonDoc] | None = None
+
+    def parse(self, body: bytes) -> _FakeSimdjsonDoc:
+        if self._live is not None and self._live() is not None:
+            raise RuntimeError("Tried to re-use a parser while its documents still exist")
+        doc = _FakeSimdjsonDoc(json.loads(body))
+        self._live = weakref.ref(doc)
+        return doc
+
+
+class SmokeExtractTests(unittest.TestCase):
+    def test_loads_lazy_keeps_earlier_chunks_usable(self) -> None:
+        module = load_script("smoke_extract.py")
+        fake_simdjson = ModuleType("simdjson")
+        fake_simdjson.Parser = _FakeSimdjsonParser  # type: ignore[attr-defined]
+        with mock.patch.object(module, "simdjson", fake_simdjson):
+            first = module.loads_lazy(b'{"extract_id": "ex_1"}')
+            second = module.loads_lazy(b'{"extract_id": "ex_2"}')
+        self.assertEqual(first.get("extract_id"), "ex_1")
+        self.assertEqual(second.get("extract_id"), "ex_2")
+
+    def test_smoke_extract_sends_urls_file_in_chunks(self) -> None:
+        module = load_script("smoke_extract.py")
+        fake_simdjson = ModuleType("simdjson")
+        fake_simdjson.Parser = _FakeSimdjsonParser  # type: ignore[attr-defined]
+        sent: list[list[str]] = []
+
+        def fake_urlopen(req: Any, timeout: float) -> Any:
+            urls = json.loads(req.data)["urls"]
+            sent.append(urls)
+            body = json.dumps({"extract_id": f"ex_{len(sent)}", "results": [{"url": u} for u in urls]})
+            resp = mock.MagicMock()
+            resp.__enter__.return_value = resp
+            resp.getcode.return_value = 200
+            resp.read.return_value = body.encode("utf-8")
+            return resp
+
+        with tempfile.TemporaryDirectory() as td:
+            urls_file = Path(td) / "urls.txt"
+            urls_file.write_text("https://a.example\nhttps://b.example\nhttps://c.example\n")
+            with (
+                mock.patch.object(module, "simdjson", fake_simdjson),
+                mock.patch.object(module.urllib.request, "urlopen", fake_urlopen),
+            ):
+                proc = run_main(
+                    "smoke_extract.py", "--api-key", "k", "--urls-file", str(urls_file), "--batch-size", "2"
+                )
+        self.assertEqual(proc.returncode, 0, proc.stdout + proc.stderr)
+        self.assertEqual(sent, [["https://a.example", "https://b.example"], ["https://c.example"]])
+        self.assertIn("chunk=2/2 urls=1", proc.stdout)
+        self.assertIn("extract_id=ex_2", proc.stdout)
+
+
+class _StaleConnection:
+    """Keep-alive connection the server has already closed: the first response read fails."""
+
+    def __init__(self) -> None:
+        self.sock: object | None = object()
+        self.requests: list[str] = []
+
+    def request(self, method: str, target: str, body: bytes | None = None, headers: Any = None) -> None:
+        self.requests.append(method)
+
+    def getresponse(self) -> Any:
+        if len(self.requests) == 1:
+            raise http.client.RemoteDisconnected("Remote end closed connection without response")
+        resp = mock.Mock(status=200)
+        resp.read.return_value = b'{"status": "running"}'
+        return resp
+
+    def close(self) -> None:
+        self.sock = None
+
+
+class SmokeTaskRunTests(unittest.TestCase):
+    def test_http_json_retries_only_idempotent_requests_on_stale_connection(self) -> None:
+        module = load_script("smoke_task_run.py")
+        url = "https://api.example.test/v1/tasks/runs"
+        with mock.patch.object(module, "_uses_proxy", return_value=False):
+            conn = _StaleConnection()
+            with mock.patch.object(module, "_pooled_connection", return_value=conn):
+                self.assertEqual(module.http_json("GET", url, "k"), (200, {"status": "running"}))
+            self.assertEqual(conn.requests, ["GET", "GET"])
+
+            conn = _StaleConnection()
+            with mock.patch.object(module, "_pooled_connection", return_value=conn):
+                with self.assertRaises(http.client.RemoteDisconnected):
+                    module.http_json("POST", url, "k", payload={"input": "x"})
+            self.assertEqual(conn.requests, ["POST"])
+
+    def test_iter_sse_events_parses_multiline_data_and_comments(self) -> None:
+        module = load_script("smoke_task_run.py")
+        lines = [
+            b": keep-alive\n",
+            b"event: task_run.state\n",
+            b"data: {\"a\":\n",
+            b"data: 1}\n",
+            b"\n",
+            b"data:no-space\r\n",
+            b"\r\n",
+            b"event: ignored-without-data\n",
+            b"\n",
+            b"data: trailing\n",
+        ]
+        self.assertEqual(
+            list(module.iter_sse_events(lines)),
+            [("task_run.state", '{"a":\n1}'), (None, "no-space"), (None, "trailing")],
+        )
+
+    def test_follow_run_events_stops_at_deadline_on_heartbeats(self) -> None:
+        module = load_script("smoke_task_run.py")
+        sent: list[bytes] = []
+
+        def heartbeats() -> Iterator[bytes]:
+            while True:
+                sent.append(b": ping\n")
+                yield sent[-1]
+
+        resp = mock.MagicMock()
+        resp.__enter__.return_value = heartbeats()
+        with mock.patch.object(module.urllib.request, "urlopen", return_value=resp) as urlopen:
+            status = module.follow_run_events(
+                "https://api.example.test/events", "k", [], timeout=60.0, deadline=time.time() - 1, log=lambda _: None
+            )
+        self.assertIsNone(status)
+        self.assertEqual(len(sent), 1)
+        self.assertLessEqual(urlopen.call_args.kwargs["timeout"], 0.1)
+
+    def test_smoke_task_run_falls_back_to_polling_after_event_stream(self) -> None:
+        module = load_script("smoke_task_run.py")
+        stream = mock.MagicMock()
+        stream.__enter__.return_value = iter(
+            [b'data: {"type": "task_run.state", "run": {"status": "running", "is_active": true}}\n', b"\n"]
+        )
+        calls: list[tuple[str, str]] = []
+
+        def fake_http_json(method: str, url: str, api_key: str, **kwargs: Any) -> tuple[int, Any]:
+            calls.append((method, url))
+            if method == "POST":
+                return 202, {"run_id": "run_1"}
+            if "/result" in url:
+                return 200, {"run": {"status": "completed"}, "output": {"type": "text", "content": "hi"}}
+            return 200, {"status": "completed", "is_active": False}
+
+        with (
+            mock.patch.object(module.urllib.request, "urlopen", return_value=stream),
+            mock.patch.object(module, "http_json", fake_http_json),
+        ):
+            proc = run_main("smoke_task_run.py", "--api-key", "k", "--enable-events", "--poll", "--poll-interval", "0")
+        self.assertEqual(proc.returncode, 0, proc.stdout + proc.stderr)
+        self.assertIn("run_status=running", proc.stdout)
+        self.assertIn("falling back to polling", proc.stdout)
+        self.assertIn("run_status=completed", proc.stdout)
+        self.assertEqual([call[0] for call in calls], ["POST", "GET", "GET"])
+        self.assertTrue(calls[1][1].endswith("/v1/tasks/runs/run_1"), calls)
+
+    def test_smoke_task_run_batch_keeps_input_order_and_isolates_failures(self) -> None:
+        module = load_script("smoke_task_run.py")
+        release_first = threading.Event()
+
+        def fake_http_json(method: str, url: str, api_key: str, **kwargs: Any) -> tuple[int, Any]:
+            if method == "POST":
+                task_input = kwargs["payload"]["input"]
+                if task_input == "first":
+                    # Finish last, so input order must not come from completion order.
+                    release_first.wait(5)
+                if task_input == "boom":
+                    raise ConnectionResetError("connection reset")
+                if task_input == "rejected":
+                    return 422, {"error": "bad input"}
+                release_first.set()
+                return 202, {"run_id": f"run_{task_input}"}
+            return 200, {"run": {"status": "completed"}, "output": {"type": "text", "content": url}}
+
+        with tempfile.TemporaryDirectory() as td:
+            inputs = Path(td) / "inputs.txt"
+            inputs.write_text("first\nboom\n\nrejected\nlast\n")
+            with mock.patch.object(module, "http_json", fake_http_json):
+                proc = run_main("smoke_task_run.py", "--api-key", "k", "--inputs", str(inputs), "--concurrency", "4")
+        self.assertEqual(proc.returncode, 1, proc.stdout + proc.stderr)
+        lines = proc.stdout.splitlines()
+        prefixes = [line.split(" ", 1)[0] for line in lines[:-1]]
+        self.assertEqual(prefixes, sorted(prefixes), proc.stdout)
+        self.assertIn("[1] run_id=run_first", lines)
+        self.assertIn("[1] OK", lines)
+        self.assertIn("[2] ERROR: connection reset", lines)
+        self.assertIn("[3] Task create smoke test failed", lines)
+        self.assertIn("[4] OK", lines)
+        self.assertEqual(lines[-1], "batch_runs=4 ok=2 failed=2")
+
+    def test_smoke_task_run_batch_succeeds_when_every_run_does(self) -> None:
+        module = load_script("smoke_task_run.py")
+
+        def fake_http_json(method: str, url: str, api_key: str, **kwargs: Any) -> tuple[int, Any]:
+            if method == "POST":
+                return 202, {"run_id": "run_1"}
+            return 200, {"run": {"status": "completed"}, "output": {"type": "text", "content": "hi"}}
+
+        with mock.patch.object(module, "http_json", fake_http_json):
+            proc = run_main("smoke_task_run.py", "--api-key", "k", "--batch", "3")
+        self.assertEqual(proc.returncode, 0, proc.stdout + proc.stderr)
+        self.assertEqual(proc.stdout.splitlines()[-1], "batch_runs=3 ok=3 failed=0")
+        ok_lines = [line for line in proc.stdout.splitlines() if line.endswith(" OK")]
+        self.assertEqual(ok_lines, ["[1] OK", "[2] OK", "[3] OK"])
+
 
 class SmokeSkipTests(unittest.TestCase):
     def test_smoke_scripts_skip_without_api_key(self) -> None:
         for script in ("smoke_search.py", "smoke_extract.py", "smoke_task_run.py"):
             with self.subTest(script=script):
-                proc = run_py(script, "--api-key", "")
+                proc = run_main(script, "--api-key", "")
                 self.assertEqual(proc.returncode, 0, proc.stdout + proc.stderr)
                 self.assertIn("SKIPPED", proc.stdout)
 